@@ -10,6 +10,7 @@ from bottom_win import bgetstr
 # Application Constants
 SERVICE_ID = "ednasg"
 OPENAI_KEY_ID = "openai_api_key"
+API_KEY_ENV = "OPENAI_API_KEY"
 
 def get_openai_api_key():
     """Fetch or prompt for OpenAI API key.
@@ -17,10 +18,7 @@ def get_openai_api_key():
     Returns:
         str: OpenAI API key
     """
-    if os.name == 'nt':
-        keyring.set_keyring(WinVaultKeyring())
-    
-    api_key = keyring.get_password(SERVICE_ID, OPENAI_KEY_ID)
+    api_key = get_stored_api_key()
     
     # Prompt for key if not found
     if not api_key:
@@ -30,6 +28,18 @@ def get_openai_api_key():
     
     return api_key
 
+def get_stored_api_key():
+    """Get the OpenAI API key without prompting, for non-interactive use.
+    
+    Returns:
+        str: Key from the OPENAI_API_KEY environment variable or the keyring, or None
+    """
+    if os.environ.get(API_KEY_ENV):
+        return os.environ[API_KEY_ENV]
+    if os.name == 'nt':
+        keyring.set_keyring(WinVaultKeyring())
+    return keyring.get_password(SERVICE_ID, OPENAI_KEY_ID)
+
 def reset_credentials(callback=None):
     """Reset API and Oxylabs credentials.
     
@@ -0,0 +1,233 @@
+import calendar
+import hashlib
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import config
+
+# Store Constants
+STORE_FILE = 'articles.db'          # SQLite database next to the config file
+LOAD_LIMIT = 5000                   # Maximum number of articles loaded for selection
+GOOGLE_NEWS_FEED = 'google_news'    # Feed name used for Google News results
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')    # Query parameters dropped from URLs
+SQL_VARIABLE_LIMIT = 500            # Values bound per statement, under SQLite's limit
+SCHEMA_VERSION = 1                  # Bumped when existing stores need migrating, see _migrate
+
+_local = threading.local()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    feed TEXT,
+    guid TEXT,
+    url TEXT,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    date REAL NOT NULL,
+    ingested REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_title ON articles (title);
+CREATE TABLE IF NOT EXISTS article_feeds (
+    feed TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (feed, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_article_feeds_key ON article_feeds (key);
+CREATE TABLE IF NOT EXISTS feed_state (
+    feed TEXT PRIMARY KEY,
+    last_polled REAL NOT NULL,
+    next_poll REAL NOT NULL,
+    interval REAL NOT NULL
+);
+"""
+
+def ingest(articles, feed=None):
+    """Insert new articles into the store and update ones already seen.
+
+    An article carried by several feeds is stored once and listed under
+    each of them.
+
+    Args:
+        articles: List of article dictionaries
+        feed: Feed the articles came from, used when an article has no 'feed' key
+
+    Returns:
+        int: Number of articles that were not in the store before
+    """
+    now = time.time()
+    rows = {}
+    for article in articles:            # Later duplicates in the batch win
+        key = article.get('id') or article_id(article)
+        rows[key] = (key, article.get('feed') or feed, article.get('guid'), article.get('url'),
+                     article.get('title') or '', article.get('summary') or '', _to_timestamp(article.get('date')), now)
+    if not rows:
+        return 0
+    with _get_connection() as conn:
+        keys = list(rows)
+        existing = sum(
+            conn.execute(f"SELECT COUNT(*) FROM articles WHERE key IN ({','.join('?' for _ in chunk)})", chunk).fetchone()[0]
+            for chunk in (keys[i:i + SQL_VARIABLE_LIMIT] for i in range(0, len(keys), SQL_VARIABLE_LIMIT))
+        )
+        conn.executemany("""
+            INSERT INTO articles (key, feed, guid, url, title, summary, date, ingested)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                feed = COALESCE(articles.feed, excluded.feed),
+                title = excluded.title,
+                summary = excluded.summary,
+                date = excluded.date
+        """, rows.values())
+        conn.executemany("INSERT OR IGNORE INTO article_feeds (feed, key) VALUES (?, ?)",
+                         [(row[1], row[0]) for row in rows.values() if row[1]])
+    return len(rows) - existing
+
+def load_articles(feeds=None, limit=LOAD_LIMIT):
+    """Load stored articles, newest first.
+
+    Args:
+        feeds: Optional list of feeds to restrict the results to
+        limit: Maximum number of articles to return
+
+    Returns:
+        list: Article dictionaries, 'feed' being the first feed each was seen in
+    """
+    conn = _get_connection()
+    query = "SELECT key, feed, guid, url, title, summary, date FROM articles"
+    params = []
+    if feeds and len(feeds) <= SQL_VARIABLE_LIMIT:
+        query += f" WHERE key IN (SELECT key FROM article_feeds WHERE feed IN ({','.join('?' for _ in feeds)}))"
+        params.extend(feeds)
+    elif feeds:                                     # Too many to bind, match against a temporary table instead
+        with conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected_feeds (feed TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM selected_feeds")
+            conn.executemany("INSERT OR IGNORE INTO selected_feeds (feed) VALUES (?)", ((feed,) for feed in feeds))
+        query += " WHERE key IN (SELECT key FROM article_feeds WHERE feed IN (SELECT feed FROM selected_feeds))"
+    query += " ORDER BY date DESC LIMIT ?"
+    params.append(limit)
+
+    return [
+        {'id': key, 'date': time.gmtime(date), 'title': title, 'summary': summary, 'url': url, 'feed': feed, 'guid': guid}
+        for key, feed, guid, url, title, summary, date in conn.execute(query, params)
+    ]
+
+def get_feed_state(feed):
+    """Get the polling state of a feed.
+
+    Args:
+        feed: Feed URL
+
+    Returns:
+        dict: 'last_polled', 'next_poll' and 'interval' in seconds, or None if never polled
+    """
+    row = _get_connection().execute(
+        "SELECT last_polled, next_poll, interval FROM feed_state WHERE feed = ?", (feed,)).fetchone()
+    if row is None:
+        return None
+    return {'last_polled': row[0], 'next_poll': row[1], 'interval': row[2]}
+
+def set_feed_state(feed, last_polled, interval):
+    """Record that a feed was polled and when it should be polled next.
+
+    Args:
+        feed: Feed URL
+        last_polled: Unix timestamp of the poll
+        interval: Seconds until the next poll
+    """
+    with _get_connection() as conn:
+        conn.execute("""
+            INSERT INTO feed_state (feed, last_polled, next_poll, interval) VALUES (?, ?, ?, ?)
+            ON CONFLICT(feed) DO UPDATE SET
+                last_polled = excluded.last_polled, next_poll = excluded.next_poll, interval = excluded.interval
+        """, (feed, last_polled, last_polled + interval, interval))
+
+def is_fresh(feed):
+    """Check whether a feed was polled recently enough to skip fetching it.
+
+    Args:
+        feed: Feed URL
+
+    Returns:
+        bool: True if the feed's next poll is still in the future
+    """
+    state = get_feed_state(feed)
+    return state is not None and time.time() < state['next_poll']
+
+def count():
+    """Get the number of stored articles."""
+    return _get_connection().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+def canonical_url(url):
+    """Normalize a URL so the same article always maps to the same string.
+
+    Args:
+        url: Article URL
+
+    Returns:
+        str: URL with lowercase scheme and host, no fragment and no tracking parameters
+    """
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMS)
+    ))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+def article_id(article):
+    """Get the stable ID of an article, so the same article gets the same ID across re-fetches.
+
+    GUIDs that are URLs, and article URLs, name a story wherever it is
+    published, so the same story carried by several feeds gets one ID. Other
+    GUIDs, such as "1" or "post-42", are only unique within their feed, so
+    they are hashed together with the feed, as is the title when an article
+    has nothing else. IDs are also the store's keys.
+
+    Args:
+        article: Article dictionary
+
+    Returns:
+        str: Hex digest identifying the article
+    """
+    guid = article.get('guid')
+    if guid and _is_url(guid):
+        source = canonical_url(guid)
+    elif guid:
+        source = f"{article.get('feed') or ''}\n{guid}"
+    elif article.get('url'):
+        source = canonical_url(article['url'])
+    else:
+        source = f"{article.get('feed') or ''}\n{article.get('title', '')}"
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+# Helpers
+def _get_connection():
+    """Get this thread's connection to the store, creating the schema on first use."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(config.get_data_path(STORE_FILE), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")     # Readers do not block the writer
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        _local.conn = conn
+    return conn
+
+def _migrate(conn):
+    """Bring a store written by an older version up to SCHEMA_VERSION."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    with conn:                                      # Feed membership used to be the single 'feed' column
+        conn.execute("INSERT OR IGNORE INTO article_feeds (feed, key) SELECT feed, key FROM articles WHERE feed IS NOT NULL")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+def _is_url(text):
+    """Check whether a string is an http(s) URL."""
+    return urlsplit(text.strip()).scheme.lower() in ('http', 'https')
+
+def _to_timestamp(date):
+    """Convert a struct_time in UTC to a Unix timestamp."""
+    return float(calendar.timegm(date)) if date else 0.0
@@ -1,9 +1,14 @@
 import time
 import curses
-import feedparser
 import bottom_win
 import message_win
 import utils
+import feed_fetcher
+import article_store
+import poller
+import resilience
+import search_index
+import dedup
 from pgn import pgn_search
 
 # Main Public Functions
@@ -12,21 +17,33 @@ def get_manual_article():
     title = _get_article_title()
     message_win.print(f"Title: {title}")
     summary = _get_article_summary()
-    return [{'title': title, 'summary': summary, 'date': time.localtime(), 'url': None}]
+    article = {'title': title, 'summary': summary, 'date': time.localtime(), 'url': None}
+    article['id'] = article_store.article_id(article)
+    return [article]
 
 def get_rss_articles(rss_url):
     """Fetch and parse articles from RSS feed."""
     message_win.erase()
+    if isinstance(rss_url, list):   # Multiple feeds selected
+        return _get_multi_feed_articles(rss_url)
+    if rss_url == utils.HISTORY_HOTKEY:
+        return get_stored_articles()
     if rss_url != utils.PGN_HOTKEY:
-        message_win.print("Fetching RSS feed...")
         try:
-            feed = _fetch_and_validate_feed(rss_url)
-            if feed is None:
-                return None
-            message_win.print("RSS feed fetched successfully.")
-            time.sleep(2)
-                
-            articles = _extract_articles(feed)
+            stale = not article_store.is_fresh(rss_url)    # Skip the network if the poller refreshed it recently
+            if stale and not resilience.is_available(rss_url):     # Host keeps failing, do not wait on it again
+                message_win.print("Feed's site has been failing, showing stored articles instead.")
+                time.sleep(2)
+            elif stale:
+                message_win.print("Fetching RSS feed...")
+                articles = _fetch_and_validate_feed(rss_url)
+                if articles is None:
+                    return None
+                message_win.print("RSS feed fetched successfully.")
+                time.sleep(2)
+                poller.record_poll(rss_url, article_store.ingest(articles, rss_url))
+
+            articles = article_store.load_articles(feeds=[rss_url])  # Include previously seen articles
             if not articles:
                 _handle_no_articles()
                 return None
@@ -38,6 +55,33 @@ def get_rss_articles(rss_url):
             return None
     else:
         return _select_articles({})
+
+def get_stored_articles():
+    """Select from every article in the local store without touching the network."""
+    articles = article_store.load_articles()
+    if not articles:
+        _handle_no_articles()
+        return None
+    return _select_articles(articles)
+
+def _get_multi_feed_articles(rss_urls):
+    """Fetch several RSS feeds concurrently and select from the merged list."""
+    stale_urls = [url for url in rss_urls if not article_store.is_fresh(url)]    # Fresh feeds come from the store
+    if stale_urls:
+        message_win.print(f"Fetching {len(stale_urls)} RSS feeds...")
+        results, errors = feed_fetcher.fetch_each_feed(stale_urls)
+        for url, feed_articles in results.items():
+            poller.record_poll(url, article_store.ingest(feed_articles, url))
+        message_win.print(f"Fetched {len(stale_urls) - len(errors)}/{len(stale_urls)} feeds successfully.")
+        for url, error in list(errors.items())[:5]:    # Only show the first few failures
+            message_win.print(f"Failed: {url} ({error})")
+        time.sleep(2)
+
+    articles = article_store.load_articles(feeds=rss_urls)
+    if not articles:
+        _handle_no_articles()
+        return None
+    return _select_articles(articles)
             
 
 # Display Functions
@@ -54,9 +98,10 @@ def _display_articles(articles, start_idx, url_visible=False):
         article = articles[idx]
         title = _format_article_title(article['title'].replace('\n', ' ') if not url_visible else article['url'].replace('\n', ' '), max_width)
         date_str = time.strftime("%m,%d,%Y %H:%M:%S", article['date'])
+        sources = f"[x{len(article['duplicates']) + 1}] " if article.get('duplicates') else ""
         
         try:
-            message_win.print(f"({date_str}) {idx + 1}. {title}")
+            message_win.print(f"({date_str}) {idx + 1}. {sources}{title}")
         except curses.error:
             pass
 
@@ -83,27 +128,22 @@ def _get_article_summary():
 
 # RSS Processing Functions
 def _fetch_and_validate_feed(rss_url):
-    """Fetch and validate RSS feed."""
-    feed = feedparser.parse(rss_url)
-    if feed.bozo:
+    """Fetch and validate RSS feed, reusing the cached copy if it has not changed."""
+    try:
+        return feed_fetcher.fetch_feed(rss_url)
+    except ValueError:
         message_win.print("Error parsing RSS feed. The feed may be invalid or improperly formatted.")
         time.sleep(2)
         return None
-    return feed
-
-def _extract_articles(feed):
-    """Extract article data from feed entries."""
-    return [
-        {'date': entry.updated_parsed, 'title': entry.title, 'summary': entry.summary, 'url': entry.link}
-        for entry in feed.entries
-    ]
 
 # Selection Functions
 def _select_articles(articles):
     """Let user select articles from the list."""
     article_scroll_idx = 0
+    articles = dedup.cluster_articles(articles) if articles else articles  # One entry per story
     filtered_articles = articles  # New: Keep track of filtered articles
     search_term = ""  # New: Keep track of current search term
+    pending_index = search_index.start_index(articles or [])  # Built in the background while the list is read
     view_url = False
 
     def scroll_down():
@@ -123,8 +163,16 @@ def _select_articles(articles):
         article_scroll_idx = 0
         return None
 
+    def filter_articles(text):  # Re-filter on every keystroke
+        nonlocal filtered_articles, article_scroll_idx
+        article_scroll_idx = 0
+        if text.strip():
+            filtered_articles = [articles[i] for i in search_index.search(pending_index.result(), text)]
+        else:
+            filtered_articles = articles
+
     def search_callback():  # New: Handle search functionality
-        nonlocal filtered_articles, article_scroll_idx, search_term
+        nonlocal search_term
         search_term = bottom_win.handle_input(
             "Search: ",
             lambda: _display_articles(filtered_articles, article_scroll_idx),
@@ -132,16 +180,10 @@ def _select_articles(articles):
             hotkeys={
                 curses.KEY_DOWN: (scroll_down, "Scroll down"),
                 curses.KEY_UP: (scroll_up, "Scroll up"),
-            }
+            },
+            change_callback=filter_articles
         )
-        article_scroll_idx = 0
-        if search_term:
-            filtered_articles = [
-                article for article in articles
-                if search_term.lower() in article['title'].lower()
-            ]
-        else:
-            filtered_articles = articles
+        filter_articles(search_term or "")
         return None
     
     def view_url_callback():
@@ -161,6 +203,9 @@ def _select_articles(articles):
         if not articles:
             _handle_no_articles()
             return None
+        article_store.ingest(articles, article_store.GOOGLE_NEWS_FEED)
+        articles = filtered_articles = dedup.cluster_articles(articles)
+        pending_index = search_index.start_index(articles)
     
     choices = bottom_win.handle_input(
         "Enter your article selection: ",
@@ -182,16 +227,10 @@ def _select_articles(articles):
     if not selected_indices:
         return None
         
-    # New: Map filtered indices back to original article indices
-    if filtered_articles != articles:
-        original_indices = []
-        for filtered_idx in selected_indices:
-            filtered_article = filtered_articles[filtered_idx]
-            original_idx = articles.index(filtered_article)
-            original_indices.append(original_idx)
-        selected_indices = original_indices
-
-    filtered_articles = [articles[i] for i in selected_indices]
+    # Map filtered picks back to articles by their stable IDs, dropping repeats
+    articles_by_id = {article['id']: article for article in articles}
+    selected_ids = dict.fromkeys(filtered_articles[i]['id'] for i in selected_indices)
+    filtered_articles = [articles_by_id[article_id] for article_id in selected_ids]
     article_scroll_idx = 0
     while True:
         confirmation = bottom_win.handle_input(
@@ -0,0 +1,382 @@
+import calendar
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+from jsonschema.validators import validator_for
+import article_store
+import condense
+import config
+import dalle
+import dedup
+import engagement
+import feed_fetcher
+import news_script
+import poller
+import render_pool
+import scrape
+
+# Batch Constants
+BATCH_WORKERS = 4               # Jobs run at once
+CONTENT_METHODS = ("summary", "scrape", "headless")
+UNSAFE_NAME_PATTERN = re.compile(r"[^\w.-]+")      # Characters a job name cannot put into a path
+IMAGE_QUALITIES = ("standard", "hd")
+IMAGE_RESOLUTIONS = ("1024x1024", "1792x1024", "1024x1792")
+
+JOB_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "feeds": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+        "articles": {
+            "type": ["array", "null"],
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "summary": {"type": "string"},
+                    "url": {"type": "string"}
+                },
+                "required": ["title"],
+                "anyOf": [{"required": ["summary"]}, {"required": ["url"]}]
+            },
+            "minItems": 1
+        },
+        "max_articles": {"type": "integer", "minimum": 1},
+        "max_age_hours": {"type": "number", "exclusiveMinimum": 0},
+        "keywords": {"type": "array", "items": {"type": "string"}},
+        "exclude": {"type": "array", "items": {"type": "string"}},
+        "content": {"enum": list(CONTENT_METHODS)},
+        "condense": {"enum": [None, *condense.METHODS]},
+        "prompt": {"type": "string"},
+        "score": {"type": "boolean"},
+        "output": {"type": ["string", "null"]},
+        "images": {"type": "integer", "minimum": 0, "maximum": 10},
+        "image_quality": {"enum": list(IMAGE_QUALITIES)},
+        "image_resolution": {"enum": list(IMAGE_RESOLUTIONS)},
+        "image_output": {"type": "string"}
+    },
+    "required": ["name"],
+    "additionalProperties": False
+}
+JOB_DEFAULTS = {
+    "feeds": ["*"],             # Feed selectors, see config.select_feed_urls
+    "articles": None,           # Articles given inline are used instead of the feeds
+    "max_articles": 5,
+    "max_age_hours": 24,
+    "keywords": [],             # If given, articles must mention at least one
+    "exclude": [],              # Articles mentioning any of these are skipped
+    "content": "summary",
+    "condense": None,
+    "prompt": "",               # Empty uses the default prompt
+    "score": False,
+    "output": None,             # Script path, may use {name} and {date}
+    "images": 0,                # DALL-E images to generate for the script
+    "image_quality": "standard",
+    "image_resolution": "1024x1024",
+    "image_output": "images/{name}-{date}-{index}.png"
+}
+
+_job_validator = validator_for(JOB_SCHEMA)(JOB_SCHEMA)
+
+def load_jobs(path):
+    """Load and validate jobs from a YAML or JSON job file.
+
+    The file holds a single job, a list of jobs, or a mapping with a 'jobs'
+    list and optional 'defaults' applied to each of them.
+
+    Args:
+        path: Path to the job file
+
+    Returns:
+        list: Job dictionaries with every default filled in
+
+    Raises:
+        ValidationError: If a job is malformed
+        OSError: If the file cannot be read
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        document = yaml.safe_load(f) or {}
+    defaults = {}
+    if isinstance(document, dict) and 'jobs' in document:
+        defaults, document = document.get('defaults') or {}, document['jobs']
+    jobs = document if isinstance(document, list) else [document]
+
+    return [validate_job(job, defaults) for job in jobs]
+
+def validate_job(job, defaults=None):
+    """Validate one job and fill in its defaults.
+
+    Args:
+        job: Job dictionary, e.g. parsed from a file or a request body
+        defaults: Optional values used for keys the job leaves out
+
+    Returns:
+        dict: The job with every default filled in
+
+    Raises:
+        ValidationError: If the job is malformed
+    """
+    if isinstance(job, dict):
+        job = {**(defaults or {}), **job}
+    _job_validator.validate(job)
+    return {**JOB_DEFAULTS, **job}
+
+def run_jobs(client, jobs, workers=BATCH_WORKERS):
+    """Run jobs concurrently without any user interaction.
+
+    Every feed the jobs use is refreshed once up front, so jobs sharing
+    feeds do not fetch them twice.
+
+    Args:
+        client: OpenAI client instance, shared by every job
+        jobs: Jobs from load_jobs
+        workers: Maximum number of jobs run at once
+
+    Returns:
+        list: One result dictionary per job, in input order
+    """
+    job_urls = [_job_feed_urls(job) for job in jobs]
+    feed_errors = refresh_feeds(list(dict.fromkeys(url for urls in job_urls for url in urls)))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as executor:
+        results = list(executor.map(lambda job: run_job(client, job, refresh=False), jobs))
+    for result, urls in zip(results, job_urls):
+        result['feed_errors'] = {url: feed_errors[url] for url in urls if url in feed_errors}
+    return results
+
+def run_job(client, job, refresh=True, on_event=None, output_dir=None):
+    """Run one job from feed fetching to the saved script and images, never raising.
+
+    Args:
+        client: OpenAI client instance
+        job: Job from load_jobs or validate_job
+        refresh: Fetch the job's stale feeds first
+        on_event: Optional function called with ("stage", name) as each stage
+                  starts and ("chunk", text) as the script streams in
+        output_dir: If given, output paths are relative to it and may not leave it
+
+    Returns:
+        dict: 'name', 'status' ("ok" or "error"), 'articles', 'script',
+              'score', 'output', 'images', 'timings' in seconds, and 'error'
+              and 'stage' on failure
+    """
+    result = {'name': job['name'], 'status': "ok", 'articles': [], 'script': None, 'score': None,
+              'output': None, 'images': [], 'timings': {}}
+    stage = "fetch"
+    try:
+        if on_event:
+            on_event("stage", stage)
+        start = time.perf_counter()
+        urls = _job_feed_urls(job)
+        if not urls and not job['articles']:
+            raise ValueError(f"no feeds match {job['feeds']}")
+        if refresh:
+            refresh_feeds(urls)
+        stage = _finish_stage(result, stage, "select", start, on_event)
+
+        start = time.perf_counter()
+        if job['articles']:
+            articles = [{'date': None, 'summary': "", 'url': None, **article} for article in job['articles']]
+            articles = [{**article, 'id': article_store.article_id(article)} for article in articles]
+        else:
+            articles = select_articles(article_store.load_articles(feeds=urls), job)
+        if not articles:
+            raise ValueError("no articles matched the job's rules")
+        result['articles'] = [{'id': a['id'], 'title': a['title'], 'url': a['url']} for a in articles]
+        stage = _finish_stage(result, stage, "content", start, on_event)
+
+        start = time.perf_counter()
+        articles = gather_content(articles, job['content'])
+        if job['condense']:
+            articles = condense.condense_articles(client, articles, job['condense'])
+        stage = _finish_stage(result, stage, "generate", start, on_event)
+
+        start = time.perf_counter()
+        result['script'] = _generate(client, articles, job['prompt'], on_event)
+        stage = _finish_stage(result, stage, "score", start, on_event)
+
+        start = time.perf_counter()
+        if job['score']:
+            result['score'] = engagement.score_script(client, result['script'])
+        stage = _finish_stage(result, stage, "save", start, on_event)
+
+        start = time.perf_counter()
+        if job['output']:
+            result['output'] = save_script(result['script'], job['output'], job['name'], output_dir)
+        stage = _finish_stage(result, stage, "images", start, on_event)
+
+        start = time.perf_counter()
+        if job['images']:
+            paths = [_format_path(job['image_output'], job['name'], output_dir, index=index)
+                     for index in range(job['images'])]
+            result['images'] = dalle.generate_images(client, result['script'], paths,
+                                                     job['image_quality'], job['image_resolution'])
+        _finish_stage(result, stage, None, start, on_event)
+    except Exception as e:
+        result.update(status="error", stage=stage, error=str(e) or type(e).__name__)
+    return result
+
+def refresh_feeds(urls):
+    """Fetch and store the feeds the poller has not refreshed recently.
+
+    Args:
+        urls: Feed URLs
+
+    Returns:
+        dict: {url: error message} for feeds that failed
+    """
+    stale_urls = [url for url in urls if not article_store.is_fresh(url)]
+    results, errors = feed_fetcher.fetch_each_feed(stale_urls)
+    for url, articles in results.items():
+        poller.record_poll(url, article_store.ingest(articles, url))
+    return {url: str(error) for url, error in errors.items()}
+
+def select_articles(articles, job):
+    """Pick articles for a job by its rules, one per story, newest first.
+
+    Args:
+        articles: Article dictionaries, newest first
+        job: Job with 'max_age_hours', 'keywords', 'exclude' and 'max_articles'
+
+    Returns:
+        list: Selected articles
+    """
+    cutoff = time.time() - job['max_age_hours'] * 60 * 60
+    keywords = [keyword.lower() for keyword in job['keywords']]
+    excluded = [keyword.lower() for keyword in job['exclude']]
+    selected = []
+    for article in dedup.cluster_articles(articles):
+        if calendar.timegm(article['date']) < cutoff:
+            continue
+        text = f"{article['title']} {article['summary']}".lower()
+        if keywords and not any(keyword in text for keyword in keywords):
+            continue
+        if any(keyword in text for keyword in excluded):
+            continue
+        selected.append(article)
+        if len(selected) >= job['max_articles']:
+            break
+    return selected
+
+def gather_content(articles, method):
+    """Get the text used for each article: its summary, a scrape, or a headless render.
+
+    Args:
+        articles: Selected articles
+        method: One of CONTENT_METHODS
+
+    Returns:
+        list: Articles prepared for the prompt, in input order
+    """
+    if method == "summary":
+        return [news_script.prepare_article(article) for article in articles]
+    results = render_pool.iter_rendered_articles(articles) if method == "headless" else scrape.iter_scraped_articles(articles)
+    gathered = [None] * len(articles)
+    for index, article in results:
+        gathered[index] = news_script.prepare_article(article)
+    return gathered
+
+def save_script(script, template, name, output_dir=None):
+    """Write a script to a path built from a template.
+
+    Args:
+        script: Script text
+        template: Path that may contain {name} and {date}
+        name: Job name
+        output_dir: If given, the path is relative to it and may not leave it
+
+    Returns:
+        str: Path written
+    """
+    path = _format_path(template, name, output_dir)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(script)
+    return path
+
+def resolve_path(template, name, output_dir=None, **fields):
+    """Build an output path from a template, without creating anything.
+
+    The job name is reduced to letters, digits, '.', '-' and '_' first, so it
+    cannot add directories to the path.
+
+    Args:
+        template: Path that may contain {name}, {date} and the given fields
+        name: Job name
+        output_dir: If given, the path is relative to it and may not leave it
+        fields: Other template values, e.g. index
+
+    Returns:
+        str: The path
+
+    Raises:
+        ValueError: If the template is malformed or the path leaves output_dir
+    """
+    safe_name = UNSAFE_NAME_PATTERN.sub("_", name).strip("._") or "job"
+    try:
+        path = template.format(name=safe_name, date=time.strftime('%Y-%m-%d'), **fields)
+    except (KeyError, IndexError, AttributeError, ValueError) as e:
+        raise ValueError(f"invalid path template {template!r}: {e}") from None
+    if output_dir is None:
+        return os.path.expanduser(path)
+    root = os.path.realpath(output_dir)
+    path = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"output path {template!r} leaves the output directory")
+    return path
+
+def check_output_paths(job, output_dir):
+    """Check that a job only writes inside output_dir.
+
+    Raises:
+        ValueError: If an output template is malformed or leaves output_dir
+    """
+    if job['output']:
+        resolve_path(job['output'], job['name'], output_dir)
+    if job['images']:
+        resolve_path(job['image_output'], job['name'], output_dir, index=0)
+
+def dump_results(results, path=None):
+    """Write job results as JSON to a file, or to stdout.
+
+    Args:
+        results: Results from run_jobs
+        path: Optional output path
+    """
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if path is None:
+        print(text)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + "\n")
+
+# Helpers
+def _job_feed_urls(job):
+    """Get the URLs of every feed a job selects, without duplicates, or none if it brings its own articles."""
+    if job['articles']:
+        return []
+    return list(dict.fromkeys(url for selector in job['feeds'] for url in config.select_feed_urls(selector)))
+
+def _finish_stage(result, stage, next_stage, start, on_event=None):
+    """Record how long a stage took and name the one that follows."""
+    result['timings'][stage] = round(time.perf_counter() - start, 3)
+    if on_event and next_stage:
+        on_event("stage", next_stage)
+    return next_stage
+
+def _generate(client, articles, prompt, on_event):
+    """Generate a script, streaming it through on_event if one is given."""
+    if on_event is None:
+        return news_script.generate_script(client, articles, prompt)
+    pieces = []
+    for piece in news_script.stream_script(client, articles, prompt):
+        pieces.append(piece)
+        on_event("chunk", piece)
+    return "".join(pieces).strip()
+
+def _format_path(template, name, output_dir=None, **fields):
+    """Build an output path from a template and make sure its directory exists."""
+    path = resolve_path(template, name, output_dir, **fields)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return path
@@ -0,0 +1,78 @@
+"""Compare throughput and text quality of each article extractor.
+
+Runs every extractor in extractors.EXTRACTORS over the saved HTML fixtures
+and scores its output against the hand-checked text next to each fixture.
+Pages under fixtures/rendered only have an article once scripts run, so
+they are left to bench_render. Add pages with capture_fixture.py.
+
+Usage:
+    python benchmarks/bench_extractors.py [--rounds N]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import extractors
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+RENDERED_DIR = os.path.join(FIXTURE_DIR, 'rendered')     # Pages that need a browser
+FIXTURE_URL = "https://example.com/article"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20, help="Times each fixture is extracted.")
+    args = parser.parse_args()
+
+    fixtures = _load_fixtures()
+    print(f"{'extractor':<12}{'fixture':<26}{'ms/page':>10}{'F1':>8}{'passes':>8}")
+    for name, extractor, check in extractors.EXTRACTORS:
+        total_time, total_f1 = 0.0, 0.0
+        for fixture, (html, expected) in fixtures.items():
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                text = extractor(html, FIXTURE_URL)
+            elapsed = (time.perf_counter() - start) / args.rounds
+            f1 = _token_f1(text, expected)
+            total_time += elapsed
+            total_f1 += f1
+            print(f"{name:<12}{fixture:<26}{elapsed * 1000:>10.2f}{f1:>8.2f}{'yes' if check(text) else 'no':>8}")
+        print(f"{name:<12}{'(mean)':<26}{total_time / len(fixtures) * 1000:>10.2f}{total_f1 / len(fixtures):>8.2f}")
+
+    print()
+    for fixture, (html, _) in fixtures.items():
+        _, used = extractors.extract_text(html, FIXTURE_URL)
+        print(f"extract_text chose '{used}' for {fixture}")
+
+def _load_fixtures(rendered=False):
+    """Load each HTML fixture with its expected text, keyed by path relative to FIXTURE_DIR without .html."""
+    paths = glob.glob(os.path.join(FIXTURE_DIR, '*.html'))
+    if rendered:
+        paths += glob.glob(os.path.join(RENDERED_DIR, '*.html'))
+    fixtures = {}
+    for path in sorted(paths):
+        name = os.path.splitext(os.path.relpath(path, FIXTURE_DIR))[0].replace(os.sep, '/')
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        with open(os.path.splitext(path)[0] + '.txt', encoding='utf-8') as f:
+            expected = f.read()
+        fixtures[name] = (html, expected)
+    return fixtures
+
+def _token_f1(text, expected):
+    """Score extracted text against the expected text by bag-of-words F1."""
+    got, want = Counter(re.findall(r"\w+", text.lower())), Counter(re.findall(r"\w+", expected.lower()))
+    if not got and not want:
+        return 1.0
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / sum(got.values()), overlap / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+if __name__ == "__main__":
+    main()
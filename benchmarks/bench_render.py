@@ -0,0 +1,72 @@
+"""Measure headless render throughput and text quality on locally served fixtures.
+
+Serves the saved HTML fixtures, including the script-rendered pages that
+bench_extractors skips, from a local HTTP server, so no network is needed,
+and renders them through render_pool at the given concurrency. Needs
+playwright with chromium installed.
+
+Usage:
+    python benchmarks/bench_render.py [--rounds N] [--concurrency N]
+"""
+import argparse
+import functools
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('EDNASG_SCRAPE_CACHE', ':memory:')   # Never reuse cached text between rounds
+import render_pool
+from bench_extractors import FIXTURE_DIR, _load_fixtures, _token_f1
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="Times each fixture is rendered.")
+    parser.add_argument("--concurrency", type=int, default=render_pool.RENDER_CONCURRENCY,
+                        help="Browser contexts rendering at once.")
+    args = parser.parse_args()
+    if not render_pool.is_available():
+        sys.exit(f"playwright is not installed: {render_pool.INSTALL_HINT}")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_QuietHandler, directory=FIXTURE_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    fixtures = _load_fixtures(rendered=True)
+    articles = [
+        {'id': f"{name}-{round_}", 'date': None, 'title': name, 'summary': "", 'url': f"{base_url}/{name}.html?r={round_}"}
+        for round_ in range(args.rounds) for name in fixtures
+    ]
+    try:
+        start = time.perf_counter()
+        list(render_pool.iter_rendered_articles(articles[:1], concurrency=args.concurrency))   # Warm the pool
+        warmup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = {name: [] for name in fixtures}
+        failures = 0
+        for _, article in render_pool.iter_rendered_articles(articles, concurrency=args.concurrency):
+            if article.get('scrape_failed'):
+                failures += 1
+                continue
+            scores[article['title']].append(_token_f1(article['summary'], fixtures[article['title']][1]))
+        elapsed = time.perf_counter() - start
+    finally:
+        render_pool.close()
+        server.shutdown()
+
+    print(f"pool warm-up: {warmup * 1000:.0f} ms")
+    print(f"{len(articles)} pages in {elapsed:.2f} s ({elapsed / len(articles) * 1000:.1f} ms/page, "
+          f"concurrency {args.concurrency}, {failures} failed)")
+    for name, values in scores.items():
+        mean_f1 = sum(values) / len(values) if values else 0.0
+        print(f"{name:<26}F1 {mean_f1:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure job throughput and streaming latency of the HTTP service against a mock OpenAI API.
+
+Starts benchmarks/mock_openai.py and a JobServer in-process, submits jobs
+with inline articles over HTTP, follows each job's event stream, and
+reports time to the first script chunk, time to the result, and jobs per
+second for each worker count. Nothing leaves the machine.
+
+Usage:
+    python benchmarks/bench_server.py [--jobs N] [--workers 1 4 8] [--latency S] [--chunk-delay S]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import httpx
+from openai import OpenAI
+import server
+import mock_openai
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=32, help="Jobs submitted per round.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="Worker counts to compare.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock seconds before each response.")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="Mock seconds between streamed chunks.")
+    args = parser.parse_args()
+
+    mock = mock_openai.start(latency=args.latency, chunk_delay=args.chunk_delay)
+    client = OpenAI(api_key="mock", base_url=mock.base_url)
+    output_dir = tempfile.mkdtemp(prefix="ednasg-bench-")
+    job = {
+        'articles': [{'title': f"Story {i}", 'summary': f"Details of story {i}. " * 20} for i in range(5)],
+        'score': True,
+        'images': 1,
+        'image_output': "{name}-{index}.png",
+    }
+
+    print(f"{'workers':>8}{'jobs/s':>10}{'first chunk s':>15}{'result s':>10}{'failed':>8}")
+    for workers in args.workers:
+        job_server = server.JobServer(client, ('127.0.0.1', 0), workers, queue_size=args.jobs,
+                                      output_dir=output_dir)
+        threading.Thread(target=job_server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{job_server.server_address[1]}"
+
+        timings = [None] * args.jobs
+        start = time.perf_counter()
+        with httpx.Client(base_url=base_url, timeout=None) as http:
+            ids = [http.post("/jobs", json={**job, 'name': f"job{i}"}).json()['id'] for i in range(args.jobs)]
+            followers = [threading.Thread(target=_follow, args=(base_url, job_id, start, timings, i))
+                         for i, job_id in enumerate(ids)]
+            for follower in followers:
+                follower.start()
+            for follower in followers:
+                follower.join()
+        elapsed = time.perf_counter() - start
+        job_server.shutdown()
+        job_server.server_close()
+
+        first_chunks = [t[0] for t in timings if t[0] is not None]
+        print(f"{workers:>8}{args.jobs / elapsed:>10.2f}"
+              f"{statistics.median(first_chunks) if first_chunks else float('nan'):>15.2f}"
+              f"{statistics.median(t[1] for t in timings):>10.2f}{sum(not t[2] for t in timings):>8}")
+
+def _follow(base_url, job_id, start, timings, index):
+    """Follow one job's event stream, recording (first chunk, result, succeeded)."""
+    first_chunk = None
+    with httpx.stream("GET", f"{base_url}/jobs/{job_id}/events", timeout=None) as response:
+        event = None
+        for line in response.iter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                if event == "chunk" and first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                elif event == "result":
+                    result = json.loads(line[len("data: "):])
+                    timings[index] = (first_chunk, time.perf_counter() - start, result['status'] == "ok")
+                    return
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Measure article store ingest and load speed, and check that article IDs stay distinct across feeds.
+
+Builds a throwaway store, ingests synthetic feeds whose entries all use
+the same short GUIDs ("1", "2", ...) as many real feeds do, then loads
+them back, one feed at a time and all at once as a "*" selection does.
+Every feed must keep its own articles, under its own IDs, and a
+story shared by several feeds must keep one ID. Exits with status 1 if a
+check fails.
+
+Usage:
+    python benchmarks/bench_store.py [--feeds N] [--entries N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import article_store
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=1000, help="Feeds ingested.")
+    parser.add_argument("--entries", type=int, default=20, help="Entries per feed.")
+    args = parser.parse_args()
+    article_store.STORE_FILE = os.path.join(tempfile.mkdtemp(prefix="ednasg-bench-"), article_store.STORE_FILE)
+
+    feeds = [f"https://feeds.example/{i}.xml" for i in range(args.feeds)]
+    shared = {'guid': "https://news.example/shared-story", 'title': "Shared story", 'summary': "",
+              'url': "https://news.example/shared-story?utm_source=rss", 'date': time.gmtime()}
+    start = time.perf_counter()
+    new_counts = [article_store.ingest(_feed_articles(feed, args.entries) + [{**shared, 'feed': feed}], feed)
+                  for feed in feeds]
+    ingest_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = {feed: article_store.load_articles(feeds=[feed]) for feed in feeds}
+    load_time = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded_all = article_store.load_articles(feeds=feeds)
+    load_all_time = time.perf_counter() - start
+
+    failures = []
+    if new_counts[1:] != [args.entries] * (args.feeds - 1) or new_counts[0] != args.entries + 1:
+        failures.append(f"ingest counted {new_counts[:5]}... new articles, expected {args.entries} per feed plus the shared story once")
+    ids = {}
+    for feed, articles in loaded.items():
+        own = [article for article in articles if article['title'] != shared['title']]
+        if len(own) != args.entries or any(not article['title'].startswith(feed) for article in own):
+            failures.append(f"{feed} loaded {len(own)} of its own articles, expected {args.entries}")
+        for article in own:
+            ids.setdefault(article['id'], set()).add(feed)
+    if any(len(owners) > 1 for owners in ids.values()):
+        failures.append("feeds with the same GUIDs share article IDs")
+    shared_ids = {article['id'] for articles in loaded.values() for article in articles if article['title'] == shared['title']}
+    if len(shared_ids) != 1:
+        failures.append(f"the shared story has {len(shared_ids)} IDs, expected 1")
+    if len(loaded_all) != min(article_store.LOAD_LIMIT, args.feeds * args.entries + 1):
+        failures.append(f"loading every feed at once returned {len(loaded_all)} articles")
+
+    total = args.feeds * args.entries
+    print(f"ingest: {total} articles from {args.feeds} feeds in {ingest_time:.2f} s ({total / ingest_time:,.0f}/s)")
+    print(f"load:   {args.feeds} single-feed loads in {load_time:.2f} s ({load_time / args.feeds * 1000:.2f} ms/feed)")
+    print(f"load:   all {args.feeds} feeds at once in {load_all_time * 1000:.0f} ms ({len(loaded_all)} articles)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("checks: ok" if not failures else f"checks: {len(failures)} failed")
+    sys.exit(1 if failures else 0)
+
+def _feed_articles(feed, entries):
+    """Build a feed's entries with GUIDs numbered from 1, like many blog and CMS feeds."""
+    return [{'guid': str(i), 'title': f"{feed} entry {i}", 'summary': "", 'url': None, 'feed': feed,
+             'date': time.gmtime(time.time() - i * 60)} for i in range(1, entries + 1)]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measure how TextRank condensing scales with the number of articles.
+
+Builds synthetic articles by shuffling sentences from the saved fixtures, then
+condenses batches of increasing size through condense.condense_articles and
+reports time per article and the prompt tokens saved.
+
+Usage:
+    python benchmarks/bench_textrank.py [--sizes 10 100 500] [--sentences N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import condense
+import textrank
+import token_budget
+from bench_extractors import _load_fixtures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 300, 1000], help="Batch sizes to condense.")
+    parser.add_argument("--sentences", type=int, default=40, help="Sentences per synthetic article.")
+    args = parser.parse_args()
+
+    pool = [sentence for _, expected in _load_fixtures().values() for sentence in textrank.split_sentences(expected)]
+    rng = random.Random(0)
+    print(f"{'articles':>10}{'total s':>10}{'ms/article':>12}{'tokens in':>12}{'tokens out':>12}{'saved':>8}")
+    for size in args.sizes:
+        articles = [
+            {'title': f"Article {i}", 'summary': " ".join(rng.choices(pool, k=args.sentences))}
+            for i in range(size)
+        ]
+        tokens_in = sum(token_budget.count_tokens(article['summary']) for article in articles)
+        start = time.perf_counter()
+        condensed = condense.condense_articles(None, articles, "textrank")
+        elapsed = time.perf_counter() - start
+        tokens_out = sum(token_budget.count_tokens(article['summary']) for article in condensed)
+        print(f"{size:>10}{elapsed:>10.2f}{elapsed / size * 1000:>12.2f}{tokens_in:>12}{tokens_out:>12}"
+              f"{1 - tokens_out / tokens_in:>8.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Save an article page as an extractor fixture with a draft of its expected text.
+
+Downloads the page (or copies a saved one) into benchmarks/fixtures and
+writes the text of the headings, paragraphs and list items inside the
+article body element next to it. The draft is printed for checking: remove
+anything that is not article text, such as captions, bylines or inline
+promos, with --exclude or by editing the .txt before committing it.
+
+Pages that only show their article after running scripts go in
+fixtures/rendered, which bench_render uses and bench_extractors skips.
+
+Usage:
+    python benchmarks/capture_fixture.py NAME (--url URL | --file PATH) --body XPATH [--exclude XPATH ...] [--rendered]
+
+Example:
+    python benchmarks/capture_fixture.py wordpress_post --url https://example.com/2025/03/story/ \\
+        --body "//div[contains(@class, 'entry-content')]" --exclude "//figcaption"
+"""
+import argparse
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import lxml.html
+import extractors
+import http_client
+from bench_extractors import FIXTURE_DIR, RENDERED_DIR
+
+TEXT_TAGS = ('p', 'h2', 'h3', 'h4', 'li', 'blockquote')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name", help="Fixture name, saved as NAME.html and NAME.txt.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--url", help="Page to download.")
+    source.add_argument("--file", help="Saved page to copy.")
+    parser.add_argument("--body", required=True, help="XPath of the element holding the article.")
+    parser.add_argument("--exclude", nargs="*", default=[], help="XPaths of elements inside the body to leave out.")
+    parser.add_argument("--rendered", action="store_true", help="The article only appears after scripts run.")
+    args = parser.parse_args()
+
+    if args.url:
+        response = http_client.get(args.url)
+        response.raise_for_status()
+        html = response.text
+    else:
+        with open(args.file, encoding='utf-8') as f:
+            html = f.read()
+    expected = draft_text(html, args.body, args.exclude)
+    if not expected:
+        sys.exit(f"no text found in {args.body}")
+
+    path = os.path.join(RENDERED_DIR if args.rendered else FIXTURE_DIR, args.name)
+    with open(f"{path}.html", 'w', encoding='utf-8') as f:
+        f.write(html)
+    with open(f"{path}.txt", 'w', encoding='utf-8') as f:
+        f.write(expected + "\n")
+    print(expected)
+    print(f"\nSaved {path}.html and {path}.txt, check the text above before committing.")
+
+def draft_text(html, body, exclude=()):
+    """Collect the text blocks of an article body element.
+
+    Args:
+        html: Page HTML
+        body: XPath of the element holding the article
+        exclude: XPaths of elements to leave out
+
+    Returns:
+        str: Blocks separated by blank lines, empty if body matched nothing
+    """
+    root = lxml.html.fromstring(extractors.XML_DECLARATION.sub('', html, count=1))
+    matches = root.xpath(body)
+    if not matches:
+        return ""
+    skipped = {element for xpath in exclude for element in root.xpath(xpath)}
+    blocks = []
+    for element in matches[0].iter(*TEXT_TAGS):
+        if any(ancestor in skipped or ancestor.tag in TEXT_TAGS for ancestor in element.iterancestors()) \
+                or element in skipped:
+            continue                                # Nested blocks are part of their outer block
+        text = re.sub(r"\s+", " ", element.text_content()).strip()
+        if text:
+            blocks.append(text)
+    return "\n\n".join(blocks)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Serve a local stand-in for the OpenAI API, so the pipeline runs without a key or network.
+
+Answers the calls ednasg makes: models, chat completions (streamed or not),
+DALL-E image generation, and the image downloads that follow. Replies are
+chosen by what each request asks for, e.g. scores, image descriptions,
+digests or a script naming the prompt's articles. Point the app at it with
+OPENAI_BASE_URL and any OPENAI_API_KEY.
+
+Usage:
+    python benchmarks/mock_openai.py [--port 8766] [--latency S] [--chunk-delay S]
+"""
+import argparse
+import base64
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MOCK_PNG = base64.b64decode(    # 1x1 transparent PNG
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg==")
+SCORES = {"date": "today", "hook_strength": 4, "sentiment": "Neutral", "clarity": 5,
+          "tone_consistency": 4, "tone": "Formal", "emotional_trigger": "Curiosity"}
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    """Mock API server with configurable response delays."""
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, chunk_delay=0.0):
+        super().__init__(address, _Handler)
+        self.latency = latency              # Seconds before each response starts
+        self.chunk_delay = chunk_delay      # Seconds between streamed chunks
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/v1"
+
+def start(port=0, latency=0.0, chunk_delay=0.0):
+    """Start a mock server on a background thread.
+
+    Returns:
+        MockOpenAIServer: The running server, see its base_url
+    """
+    server = MockOpenAIServer(('127.0.0.1', port), latency, chunk_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response starts.")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Seconds between streamed chunks.")
+    args = parser.parse_args()
+    server = MockOpenAIServer(('127.0.0.1', args.port), args.latency, args.chunk_delay)
+    print(f"Mock OpenAI API on {server.base_url}, run ednasg with:")
+    print(f"    OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=mock")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/v1/models"):
+            return self._send_json({"object": "list", "data": [
+                {"id": model, "object": "model", "created": 0, "owned_by": "mock"}
+                for model in ("gpt-4o", "gpt-4o-mini", "dall-e-3")]})
+        if self.path.startswith("/images/"):
+            self.send_response(200)
+            self.send_header('Content-Type', "image/png")
+            self.send_header('Content-Length', str(len(MOCK_PNG)))
+            self.end_headers()
+            self.wfile.write(MOCK_PNG)
+            return
+        self._send_json({"error": {"message": "not found"}}, 404)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b"{}")
+        self.server.requests += 1
+        time.sleep(self.server.latency)
+        if self.path.startswith("/v1/chat/completions"):
+            return self._complete(body)
+        if self.path.startswith("/v1/images/generations"):
+            host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+            return self._send_json({"created": int(time.time()), "data": [
+                {"url": f"{host}/images/{self.server.requests}.png", "revised_prompt": body.get("prompt")}
+                for _ in range(body.get("n", 1))]})
+        self._send_json({"error": {"message": "not found"}}, 404)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _complete(self, body):
+        """Answer a chat completion, streamed as server-sent events if asked."""
+        content = _reply(body.get("messages", []))
+        model = body.get("model", "gpt-4o")
+        usage = {"prompt_tokens": sum(len(str(m.get("content", ""))) // 4 for m in body.get("messages", [])),
+                 "completion_tokens": len(content) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        if not body.get("stream"):
+            return self._send_json({
+                "id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage})
+
+        self.send_response(200)
+        self.send_header('Content-Type', "text/event-stream")
+        self.end_headers()
+        chunk = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+        for piece in re.findall(r"\S+\s*", content):
+            self._send_event({**chunk, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+            time.sleep(self.server.chunk_delay)
+        self._send_event({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (body.get("stream_options") or {}).get("include_usage"):
+            self._send_event({**chunk, "choices": [], "usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _send_event(self, data):
+        self.wfile.write(f"data: {json.dumps(data)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def _send_json(self, body, status=200):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', "application/json")
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def _reply(messages):
+    """Pick a plausible reply for what the messages ask for."""
+    system = " ".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+    user = " ".join(str(m.get("content", "")) for m in messages if m.get("role") == "user")
+    if "content evaluator" in system:
+        return f"```json\n{json.dumps(SCORES)}\n```"
+    if "DALL" in system:
+        count = re.search(r"number of images: (\d+)", user)
+        return "\n".join(f"{i}. A calm city skyline at dawn, view {i}" for i in range(1, int(count.group(1)) + 1)) \
+            if count else "A calm city skyline at dawn"
+    if "Condense" in system:
+        return " ".join(user.split()[:60])
+    titles = re.findall(r"^- (.+?):", user, re.MULTILINE)
+    return "Good evening. " + " ".join(f"In other news, {title}." for title in titles) + " That's all for tonight."
+
+if __name__ == "__main__":
+    main()
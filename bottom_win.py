@@ -24,7 +24,7 @@ def print(message):
         return
 
 
-def handle_input(prompt, callback=None, max_input_len=None, hotkeys=None, ch_mode=False):
+def handle_input(prompt, callback=None, max_input_len=None, hotkeys=None, ch_mode=False, change_callback=None):
     """Generic input handler with scrolling, cursor support, and custom hotkeys.
     
     Args:
@@ -34,6 +34,7 @@ def handle_input(prompt, callback=None, max_input_len=None, hotkeys=None, ch_mod
         hotkeys: Optional dict of {key: (function, description)} for special keys
                 Example: {SKIP_HOTKEY: (lambda: None, "Skip")}
         ch_mode: Do not record or print any input, only listen for hotkeys.
+        change_callback: Optional function called with the input text whenever it changes
     """
     
     # Initialize input and cursor position
@@ -103,6 +104,7 @@ def handle_input(prompt, callback=None, max_input_len=None, hotkeys=None, ch_mod
                 return result
             continue
 
+        previous_input = input_str
         match ch: # Handle input
             case _ if ch == ord('\n') and not ch_mode:
                 break
@@ -131,6 +133,9 @@ def handle_input(prompt, callback=None, max_input_len=None, hotkeys=None, ch_mod
         # Ensure cursor position is within bounds
         cursor_pos = max(0, min(cursor_pos, len(input_str)))
 
+        if change_callback and input_str != previous_input:
+            change_callback(input_str)
+
     return input_str
 
 def getch():
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import time
+import config
+
+# Checkpoint Constants
+CHECKPOINT_DIR = 'checkpoints'      # Stage outputs, next to the config file
+SESSION_FILE = 'session.json'       # Stages the latest session completed, inside CHECKPOINT_DIR
+MAX_CHECKPOINT_AGE = 7 * 24 * 60 * 60   # Older outputs are deleted when a new session begins
+STAGES = ("fetch", "scrape", "generate", "score", "save", "images")    # In pipeline order
+
+_session = None         # {'started', 'finished', 'stages': {stage: key}} for the running session
+_resumed = {}           # {stage: checkpoint} completed by the session being resumed
+
+def begin_session():
+    """Start recording a new session, deleting checkpoints that have aged out."""
+    global _session, _resumed
+    _session = {'started': time.time(), 'finished': False, 'stages': {}}
+    _resumed = {}
+    _write_session()
+    _prune()
+
+def resume_session():
+    """Continue the latest session if it did not finish.
+
+    Returns:
+        bool: True if there was an unfinished session, whose completed stages
+              are then available from resumed()
+    """
+    global _session, _resumed
+    try:
+        with open(_get_path(SESSION_FILE), 'r', encoding='utf-8') as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if session.get('finished'):
+        return False
+    _session = session
+    _resumed = {}
+    for stage, key in session['stages'].items():
+        record = _read(stage, key)
+        if record is None:          # Output lost, this stage and the ones after it run again
+            break
+        _resumed[stage] = record
+    return True
+
+def resumed(stage):
+    """Get a stage's checkpoint from the session being resumed.
+
+    Args:
+        stage: Name from STAGES
+
+    Returns:
+        dict: Checkpoint with 'output', or None if the stage has to run
+    """
+    return _resumed.get(stage)
+
+def finish_session():
+    """Mark the running session complete, so --resume starts afresh."""
+    if _session is not None:
+        _session['finished'] = True
+        _write_session()
+
+def stage_key(stage, inputs):
+    """Hash a stage's inputs, so identical inputs find the same checkpoint.
+
+    Args:
+        stage: Name from STAGES
+        inputs: JSON-serializable inputs of the stage
+
+    Returns:
+        str: Hex digest
+    """
+    data = json.dumps([stage, inputs], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:32]
+
+def load(stage, inputs):
+    """Find the output a stage produced earlier for the same inputs.
+
+    Args:
+        stage: Name from STAGES
+        inputs: JSON-serializable inputs of the stage
+
+    Returns:
+        dict: Checkpoint with 'output', or None if the stage has not run on these inputs
+    """
+    return _read(stage, stage_key(stage, inputs))
+
+def save(stage, inputs, output):
+    """Store a stage's output and mark the stage done in the running session.
+
+    Later stages recorded by the session are forgotten, since they were
+    computed from the output this replaces.
+
+    Args:
+        stage: Name from STAGES
+        inputs: JSON-serializable inputs of the stage
+        output: JSON-serializable output of the stage
+
+    Returns:
+        dict: The checkpoint written
+    """
+    key = stage_key(stage, inputs)
+    record = {'stage': stage, 'key': key, 'created': time.time(), 'output': output}
+    _write_json(_get_path(f"{stage}-{key}.json"), record)
+    _record_stage(stage, key)
+    return record
+
+# Helpers
+def _get_path(filename):
+    """Get the path to a file in the checkpoint directory, creating the directory."""
+    directory = config.get_data_path(CHECKPOINT_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+def _read(stage, key):
+    """Read a checkpoint, or None if it is missing or unreadable."""
+    try:
+        with open(_get_path(f"{stage}-{key}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _record_stage(stage, key):
+    """Note a completed stage in the session file, dropping the stages after it."""
+    global _session
+    if _session is None:
+        begin_session()
+    stages = {name: value for name, value in _session['stages'].items()
+              if STAGES.index(name) < STAGES.index(stage)}
+    stages[stage] = key
+    _session['stages'] = stages
+    _write_session()
+
+def _write_session():
+    """Write the running session to disk."""
+    _write_json(_get_path(SESSION_FILE), _session)
+
+def _write_json(path, data):
+    """Write JSON atomically, so a crash mid-write never leaves a torn file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, default=str)
+    os.replace(tmp_path, path)
+
+def _prune():
+    """Delete checkpoints older than MAX_CHECKPOINT_AGE."""
+    cutoff = time.time() - MAX_CHECKPOINT_AGE
+    directory = config.get_data_path(CHECKPOINT_DIR)
+    for entry in os.scandir(directory):
+        if entry.name != SESSION_FILE and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
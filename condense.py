@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import llm_cache
+import token_budget
+import textrank
+
+# Condensing Constants
+CONDENSE_MODEL = "gpt-4o-mini"      # Cheap model for the per-article map stage
+CONDENSE_TEMPERATURE = 0.2
+CONDENSE_WORKERS = 6                # Articles condensed at once
+DIGEST_TOKENS = 200                 # Target digest length
+MIN_CONDENSE_TOKENS = 300           # Shorter articles are used as they are
+CONDENSE_PROMPT = (
+    "Condense this news article into a factual digest of at most {words} words for a news anchor. "
+    "Keep names, numbers, places and dates. Do not add commentary."
+)
+
+def condense_articles(client, articles, method="gpt", workers=CONDENSE_WORKERS, on_progress=None):
+    """Map stage: condense long articles concurrently before the script is written.
+
+    Digests are cached per article, so condensing the same text again, e.g.
+    when the script is regenerated, costs nothing. Articles that fail to
+    condense keep their full text.
+
+    Args:
+        client: OpenAI client instance, unused by local methods
+        articles: List of article dictionaries
+        method: Name of a condenser in METHODS
+        workers: Maximum number of concurrent condense calls
+        on_progress: Optional function called with (done, total, article) as each one finishes
+
+    Returns:
+        list: Articles in input order, long ones with their digest as the summary
+    """
+    condenser = METHODS[method]
+    condensed = list(articles)
+    pending = [index for index, article in enumerate(articles)
+               if token_budget.count_tokens(article.get('summary') or "") >= MIN_CONDENSE_TOKENS]
+    if not pending:
+        return condensed
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as executor:
+        futures = {executor.submit(condenser, client, articles[index]['summary']): index for index in pending}
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                condensed[index] = {**articles[index], 'summary': future.result(), 'condensed': True}
+            except Exception as e:
+                condensed[index] = {**articles[index], 'condense_error': str(e) or type(e).__name__}
+            if on_progress:
+                on_progress(done, len(pending), condensed[index])
+    return condensed
+
+def condense_with_gpt(client, text):
+    """Condense one article with the cheap model, reusing a cached digest if there is one.
+
+    Digests are cached even without --llm-cache, in their own table with
+    their own statistics, see llm_cache.get_digest.
+
+    Args:
+        client: OpenAI client instance
+        text: Article text
+
+    Returns:
+        str: Digest
+    """
+    messages = [
+        {"role": "system", "content": CONDENSE_PROMPT.format(words=DIGEST_TOKENS * 3 // 4)},
+        {"role": "user", "content": text},
+    ]
+    cache_key = llm_cache.cache_key(CONDENSE_MODEL, CONDENSE_TEMPERATURE, messages)
+    cached = llm_cache.get_digest(cache_key)
+    if cached is not None:
+        return cached
+
+    response = client.chat.completions.create(
+        model=CONDENSE_MODEL,
+        messages=messages,
+        temperature=CONDENSE_TEMPERATURE,
+        max_tokens=DIGEST_TOKENS * 2,
+    )
+    if not response.choices or not response.choices[0].message.content:
+        raise ValueError("API response does not contain expected content")
+    digest = response.choices[0].message.content.strip()
+    usage = getattr(response, 'usage', None)
+    llm_cache.put_digest(cache_key, digest, CONDENSE_MODEL,
+                  getattr(usage, 'prompt_tokens', 0), getattr(usage, 'completion_tokens', 0))
+    return digest
+
+def condense_lead(client, text):
+    """Condense one article locally by keeping its opening sentences.
+
+    Args:
+        client: Unused
+        text: Article text
+
+    Returns:
+        str: The start of the article, cut at a sentence end
+    """
+    return token_budget.truncate(text, DIGEST_TOKENS)
+
+def condense_textrank(client, text):
+    """Condense one article locally to its most central sentences with TextRank.
+
+    Args:
+        client: Unused
+        text: Article text
+
+    Returns:
+        str: Key sentences in their original order
+    """
+    return textrank.summarize(text)
+
+# Condensers selectable by name as function(client, text) -> digest
+METHODS = {
+    "gpt": condense_with_gpt,
+    "lead": condense_lead,
+    "textrank": condense_textrank,
+}
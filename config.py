@@ -1,11 +1,14 @@
+import copy
 import keyring
 import json
 import os
 import bottom_win
 import message_win
 import sys
+import threading
 from time import sleep
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
 from keyring.backends.Windows import WinVaultKeyring
 
 # Configuration Constants
@@ -21,7 +24,8 @@ FEED_SCHEMA = {
             "type": "object",
             "properties": {
                 "url": {"type": "string", "format": "uri"},
-                "nickname": {"type": "string"}
+                "nickname": {"type": "string"},
+                "tags": {"type": "array", "items": {"type": "string"}}
             },
             "required": ["url", "nickname"]
         }
@@ -29,6 +33,20 @@ FEED_SCHEMA = {
     "additionalProperties": False
 }
 
+# Validators are compiled once instead of on every load
+_config_validator = validator_for(FEED_SCHEMA)(FEED_SCHEMA)
+_feed_validator = validator_for(FEED_SCHEMA)(FEED_SCHEMA["patternProperties"]["^[0-9]+$"])
+
+# Parsed config, reused until the file's mtime or size changes
+_cache_lock = threading.RLock()
+_cached_stat = None
+_cached_feeds = None
+
+# Feed registry built alongside the cached config
+_feed_keys = []         # Feed keys in display order
+_url_index = {}         # Feed URL -> feed key
+_max_key = 0            # Highest numeric feed key in use
+
 def load_config():
     """Load and validate the configuration file.
     
@@ -43,10 +61,7 @@ def load_config():
     try:
         if not os.path.exists(config_path): # Check if config file exists
             _handle_no_config()
-        with open(config_path, 'r') as f: # Open config file
-            feeds = json.load(f) # Load config
-            validate(instance=feeds, schema=FEED_SCHEMA) # Validate config
-            return feeds
+        return read_config()
     except (json.JSONDecodeError, ValidationError) as e: # Handle JSON errors
         _handle_json_error(e)
         _handle_exit()
@@ -54,9 +69,25 @@ def load_config():
         _handle_error(e)
         _handle_exit()
 
+def read_config():
+    """Read and validate the configuration file without any user interaction.
+    
+    Returns:
+        dict: Copy of the validated feed configuration, empty if no config
+              file exists; changing it does not change the configuration
+        
+    Raises:
+        ValidationError: If config fails schema validation
+        JSONDecodeError: If config is not valid JSON
+    """
+    return copy.deepcopy(_read_cached_config())
+
 def update_config(url, nickname):
     """Add a new feed to the configuration.
     
+    Only the new feed is validated, and the file is replaced atomically so
+    readers never see a partially written config.
+    
     Args:
         url: URL of the RSS feed
         nickname: Display name for the feed
@@ -66,35 +97,141 @@ def update_config(url, nickname):
     """
     feeds = load_config() # Load config, no need to catch errors, will exit if error
     try:
-        # Check for duplicate URLs
-        if any(feed['url'] == url for feed in feeds.values()):
-            bottom_win.print("URL already exists in the configuration.")
-            return feeds
-            
-        # Add new feed
-        new_key = str(len(feeds) + 1)
-        feeds[new_key] = {"url": url, "nickname": nickname}
-        validate(instance=feeds, schema=FEED_SCHEMA) # Validate config
-        
-        # Save updated config
-        with open(_get_config_path(), 'w') as f:
-            json.dump(feeds, f, indent=4)
-            
-        return feeds
+        new_feed = {"url": url, "nickname": nickname}
+        _feed_validator.validate(new_feed) # Validate new entry only
+        with _cache_lock:   # Held through the write so concurrent adds cannot drop each other's feeds
+            # Check for duplicate URLs
+            if has_feed_url(url):
+                bottom_win.print("URL already exists in the configuration.")
+                return feeds
+
+            # Add new feed and save updated config
+            feeds = dict(_read_cached_config())
+            key = str(_max_key + 1)
+            feeds[key] = new_feed
+            _register_feed(key, new_feed)
+            _write_config(feeds)
+        return read_config()
         
     except ValidationError as e:
         _handle_json_error(e)
         return load_config()  # Return current config if update failed
     except Exception as e:
         _handle_error(e) 
+        _invalidate_cache()   # Drop the unsaved feed from the registry
         return load_config()  # Return current config if update failed
 
-# Helpers
-def _get_config_path():
-    """Get the path to the configuration file.
+def add_feeds(new_feeds):
+    """Add many feeds to the configuration in a single atomic write.
     
+    Feeds are validated and deduplicated against the configuration and each
+    other in one pass, without any user interaction.
+    
+    Args:
+        new_feeds: List of feed dicts with 'url', 'nickname' and optional 'tags'
+        
     Returns:
-        str: Full path to config file
+        tuple: (list of added feeds, list of (feed, reason) tuples for skipped feeds)
+        
+    Raises:
+        OSError: If the configuration could not be written
+    """
+    added, skipped, seen = [], [], set()
+    with _cache_lock:   # Held from the duplicate check through the write
+        feeds = dict(_read_cached_config())
+        for feed in new_feeds:
+            url = feed.get('url', '').strip()
+            if url in seen or url in _url_index:
+                skipped.append((feed, "duplicate"))
+                continue
+            new_feed = {**feed, 'url': url}
+            errors = list(_feed_validator.iter_errors(new_feed))
+            if errors:
+                skipped.append((feed, errors[0].message))
+                continue
+            seen.add(url)
+            added.append(new_feed)
+
+        if not added:
+            return added, skipped
+
+        try:
+            for new_feed in added:
+                key = str(_max_key + 1)
+                feeds[key] = new_feed
+                _register_feed(key, new_feed)
+            _write_config(feeds)
+        except Exception:
+            _invalidate_cache()   # Drop the unsaved feeds from the cache
+            raise
+    return added, skipped
+
+def get_all_feeds():
+    """Get every configured feed in display order.
+    
+    Returns:
+        list: (key, details) tuples
+    """
+    with _cache_lock:
+        feeds = _read_cached_config()
+        return [(key, dict(feeds[key])) for key in _feed_keys]
+
+def select_feed_urls(selector):
+    """Get the feed URLs a selector names, without any user interaction.
+    
+    Args:
+        selector: "*" for every feed, "#tag" for tagged feeds, a feed's
+                  nickname or key, or a feed URL
+        
+    Returns:
+        list: Feed URLs, empty if nothing matches
+    """
+    feeds = _read_cached_config()
+    if selector == "*":
+        return [details['url'] for details in feeds.values()]
+    if selector.startswith("#"):
+        tag = selector[1:].strip()
+        return [details['url'] for details in feeds.values() if tag in details.get('tags', [])]
+    for key, details in feeds.items():
+        if selector in (key, details['nickname']):
+            return [details['url']]
+    return [selector] if "://" in selector else []
+
+def has_feed_url(url):
+    """Check whether a feed URL is already configured.
+    
+    Args:
+        url: URL of the RSS feed
+        
+    Returns:
+        bool: True if the URL is in the configuration
+    """
+    with _cache_lock:
+        _read_cached_config()  # Refresh the registry if the file changed
+        return url.strip() in _url_index
+
+def get_feed_page(start_idx, count):
+    """Get one page of configured feeds in display order.
+    
+    Args:
+        start_idx: Index of the first feed on the page
+        count: Maximum number of feeds on the page
+        
+    Returns:
+        list: (key, details) tuples for the feeds on the page
+    """
+    with _cache_lock:
+        feeds = _read_cached_config()
+        return [(key, dict(feeds[key])) for key in _feed_keys[start_idx:start_idx + max(0, count)]]
+
+def get_data_path(filename):
+    """Get the path to a file stored alongside the application.
+    
+    Args:
+        filename: Name of the file or directory
+        
+    Returns:
+        str: Full path to the file
     """
     # determine if application is a script file or frozen exe
     if getattr(sys, 'frozen', False):
@@ -102,7 +239,80 @@ def _get_config_path():
     elif __file__:
         application_path = os.path.dirname(__file__)
 
-    return os.path.join(application_path, CONFIG_FILE)
+    return os.path.join(application_path, filename)
+
+# Helpers
+def _get_config_path():
+    """Get the path to the configuration file.
+    
+    Returns:
+        str: Full path to config file
+    """
+    return get_data_path(CONFIG_FILE)
+
+def _read_cached_config():
+    """Get the parsed config, rereading the file only if it changed.
+
+    The result is the shared cache, so it must not be modified; new configs
+    are built as copies and stored with _write_config.
+    """
+    global _cached_stat, _cached_feeds
+    config_path = _get_config_path()
+    with _cache_lock:
+        try:
+            stat = os.stat(config_path)
+        except FileNotFoundError:           # Removed or never written, forget the old feeds too
+            _cached_stat = _cached_feeds = None
+            _build_registry({})
+            return {}
+        if _cached_feeds is not None and _cached_stat == _stat_key(stat):    # Unchanged since last read
+            return _cached_feeds
+
+        with open(config_path, 'r') as f: # Open config file
+            feeds = json.load(f) # Load config
+        _config_validator.validate(feeds) # Validate config
+        _cached_stat, _cached_feeds = _stat_key(stat), feeds
+        _build_registry(feeds)
+        return feeds
+
+def _stat_key(stat):
+    """Get the part of a file's stat result that changes when it is rewritten."""
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _invalidate_cache():
+    """Force the next read to reload the config from disk."""
+    global _cached_stat, _cached_feeds
+    with _cache_lock:
+        _cached_stat, _cached_feeds = None, None
+
+def _build_registry(feeds):
+    """Rebuild the feed key order and URL index from a parsed config."""
+    global _feed_keys, _url_index, _max_key
+    _feed_keys = list(feeds)
+    _url_index = {details['url'].strip(): key for key, details in feeds.items()}
+    _max_key = max((int(key) for key in feeds), default=0)
+
+def _register_feed(key, details):
+    """Add a single feed to the registry without rebuilding it."""
+    global _max_key
+    _feed_keys.append(key)
+    _url_index[details['url'].strip()] = key
+    _max_key = max(_max_key, int(key))
+
+def _write_config(feeds):
+    """Atomically write the configuration and update the cache.
+    
+    Args:
+        feeds: Feed configuration to save
+    """
+    global _cached_stat, _cached_feeds
+    config_path = _get_config_path()
+    tmp_path = f"{config_path}.{os.getpid()}.tmp"
+    with _cache_lock:
+        with open(tmp_path, 'w') as f:
+            json.dump(feeds, f, indent=4)
+        os.replace(tmp_path, config_path)   # Atomic on the same filesystem
+        _cached_stat, _cached_feeds = _stat_key(os.stat(config_path)), feeds
 
 def _handle_no_config():
     """Handle no configuration found."""
@@ -3,10 +3,12 @@ import bottom_win
 from message_win import clear_buffer
 from message_win import print_msg, print_buffer
 import utils
-import aiohttp
+import http_client
 import asyncio
 import utils
 import curses
+import os
+from concurrent.futures import ThreadPoolExecutor
 from screen_manager import handle_resize
 from openai import AsyncOpenAI
 
@@ -52,14 +54,15 @@ async def _generate_single_image(client, description, identifier, resolution, im
             image_url = response.data[0].url
             print_msg(f"Image URL for photo {identifier}: {image_url}")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url) as img_response:
-                    image_data = await img_response.read()
+            # Download on the shared connection pool without blocking the event loop
+            img_response = await asyncio.to_thread(http_client.get, image_url, max_bytes=http_client.MAX_IMAGE_BYTES)
+            img_response.raise_for_status()
+            image_data = img_response.content
 
             with open(f"generated_image_{identifier}.png", "wb") as file:
                 file.write(image_data)
             print_msg(f"Image {identifier} saved as 'generated_image_{identifier}.png'")
-            break
+            return f"generated_image_{identifier}.png"
 
         except Exception as e:
             utils.handle_openai_error(e, f"photo {identifier} thread")
@@ -156,6 +159,89 @@ def generate_photos(client, script, num_images=3, image_quality="standard", reso
     
     if not all_tasks.cancelled():
         bottom_win.handle_input("DALLE-3 photo generation finished. Press enter to exit...", print_buffer, None, {10: (None, "break")}, True)
+    if all_tasks.done() and not all_tasks.cancelled():
+        return [path for path in all_tasks.result() if path]     # Saved images, failed ones are left out
+    return None
+
+def generate_images(client, script, paths, image_quality="standard", resolution="1024x1024"):
+    """Describe and generate images for a script without any user interaction.
+
+    Descriptions DALL-E rejects are rewritten and retried up to MAX_RETRY times.
+
+    Args:
+        client: OpenAI client instance
+        script: Script to illustrate
+        paths: Where to save each image, one per image wanted
+        image_quality: "standard" or "hd"
+        resolution: Image size, e.g. "1024x1024"
+
+    Returns:
+        list: Paths of the images saved
+
+    Raises:
+        ValueError: If too few descriptions come back
+        openai.OpenAIError: If an API call fails
+    """
+    descriptions = describe_images(client, script, len(paths))
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        return list(executor.map(
+            lambda description, path: _save_image(client, description, path, resolution, image_quality),
+            descriptions, paths))
+
+def describe_images(client, script, num_images):
+    """Ask ChatGPT for image descriptions that fit a script.
+
+    Args:
+        client: OpenAI client instance
+        script: Script to illustrate
+        num_images: Number of descriptions wanted
+
+    Returns:
+        list: Descriptions, one per image
+
+    Raises:
+        ValueError: If the response is malformed or has too few descriptions
+    """
+    response = client.chat.completions.create(
+        model="gpt-4o",
+        messages=_create_gpt_message(script, num_images),
+        temperature=0.7
+    )
+    if not response.choices or not response.choices[0].message.content:
+        raise ValueError("API response does not contain expected content")
+    descriptions = [line.strip() for line in response.choices[0].message.content.strip().split('\n') if line.strip()]
+    if len(descriptions) < num_images:
+        raise ValueError("Not enough descriptions generated for the requested number of images.")
+    return descriptions[:num_images]
+
+def _save_image(client, description, path, resolution, image_quality):
+    """Generate one image and save it, rewriting its description if DALL-E rejects it."""
+    for retry_count in range(MAX_RETRY):
+        try:
+            response = client.images.generate(
+                model="dall-e-3",
+                prompt=description,
+                size=resolution,
+                quality=image_quality,
+                n=1,
+            )
+            break
+        except openai.BadRequestError:
+            if retry_count == MAX_RETRY - 1:
+                raise
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                messages=_recreate_description(description),
+                temperature=0.7
+            )
+            description = response.choices[0].message.content.strip() or description
+
+    img_response = http_client.get(response.data[0].url, max_bytes=http_client.MAX_IMAGE_BYTES)
+    img_response.raise_for_status()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(img_response.content)
+    return path
 
 def _description_regenerate(client, description):
     print_msg(f"recreating bad description: \"{description}\".")
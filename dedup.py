@@ -0,0 +1,93 @@
+import hashlib
+import re
+import numpy as np
+
+# Clustering Constants
+SIMHASH_BITS = 64           # Fingerprint size
+SHINGLE_SIZE = 3            # Words per shingle
+MAX_DISTANCE = 10           # Fingerprints this many bits apart or closer are near-duplicates
+
+TAG_PATTERN = re.compile(r"<[^<]+?>")
+WORD_PATTERN = re.compile(r"\w+")
+
+def cluster_articles(articles):
+    """Group near-duplicate articles and keep one representative per story.
+
+    Each representative is a copy of the newest article in its cluster, with a
+    'duplicates' list holding the other copies of the story.
+
+    Args:
+        articles: List of article dictionaries, newest first
+
+    Returns:
+        list: Representative articles in their original order
+    """
+    fingerprints = [simhash(_article_text(article)) for article in articles]
+    comparable = [i for i, fingerprint in enumerate(fingerprints) if fingerprint is not None]   # Wordless articles stay alone
+    values = np.array([fingerprints[i] for i in comparable], dtype=np.uint64)
+    parents = list(range(len(articles)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]        # Path halving
+            i = parents[i]
+        return i
+
+    for position in range(len(comparable) - 1):     # Compare against every later article at once
+        distances = np.bitwise_count(values[position + 1:] ^ values[position])
+        for other in np.flatnonzero(distances <= MAX_DISTANCE) + position + 1:
+            root_i, root_j = find(comparable[position]), find(comparable[int(other)])
+            parents[max(root_i, root_j)] = min(root_i, root_j)    # Earliest article leads
+
+    clusters = {}
+    for i in range(len(articles)):
+        clusters.setdefault(find(i), []).append(articles[i])
+    return [
+        {**members[0], 'duplicates': members[1:]} if len(members) > 1 else members[0]
+        for members in clusters.values()
+    ]
+
+def merge_cluster(article):
+    """Merge a representative and its duplicates into one prompt entry.
+
+    The longest available text is kept, since copies of the same wire story
+    are often truncated to different lengths.
+
+    Args:
+        article: Article dictionary, possibly with a 'duplicates' list
+
+    Returns:
+        dict: Article whose summary notes how many sources carried the story
+    """
+    duplicates = article.get('duplicates')
+    if not duplicates:
+        return article
+    summary = max([article] + duplicates, key=lambda member: len(member.get('summary') or ''))['summary']
+    merged = {key: value for key, value in article.items() if key != 'duplicates'}
+    merged['summary'] = f"{summary} (Reported by {len(duplicates) + 1} sources.)"
+    return merged
+
+def simhash(text):
+    """Compute a SimHash fingerprint over word shingles of a text.
+
+    Args:
+        text: Text to fingerprint
+
+    Returns:
+        int: SIMHASH_BITS-bit fingerprint, or None if the text has no words,
+             since every such text would otherwise share one fingerprint
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return None
+    shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))}
+    digests = b''.join(hashlib.blake2b(shingle.encode('utf-8'), digest_size=SIMHASH_BITS // 8).digest()
+                       for shingle in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(len(shingles), SIMHASH_BITS)
+    votes = bits.sum(axis=0) * 2 > len(shingles)    # Majority vote per bit position
+    return int.from_bytes(np.packbits(votes).tobytes(), 'big')
+
+# Helpers
+def _article_text(article):
+    """Get the title and summary text of an article without markup."""
+    return f"{article.get('title', '')} {TAG_PATTERN.sub(' ', article.get('summary') or '')}"
@@ -1,4 +1,5 @@
 import curses
+import sys
 import signal
 from openai import OpenAI
 import config
@@ -15,6 +16,16 @@ import dalle
 import os
 import engagement
 import json
+import argparse
+import poller
+import opml
+import render_pool
+import llm_cache
+import token_budget
+import condense
+import batch
+import server
+import checkpoint
 from message_win import print_msg
 from message_win import clear_buffer
 from message_win import get_multiline_input
@@ -23,31 +34,35 @@ from message_win import print_buffer
 from bottom_win import handle_input
 from bottom_win import bgetstr
 
-def main(stdscr):
-    """Main application entry point."""
+def main(stdscr, condense_method=None, resume=False):
+    """Main application entry point.
+    
+    Args:
+        stdscr: The main curses window object
+        condense_method: Optional name of a condense.METHODS entry used to digest articles first
+        resume: Continue the last unfinished session from its latest checkpoint
+    """
     _setup_environment(stdscr)
 
     try:
         # Initialize OpenAI API and configuration
         client = _initialize_openai_api()
         feeds = _initialize_config()
+        _start_session(resume)
 
-        # Get article content
-        selected_articles = _get_article_content(feeds)
-        scraped_articles = _scrape_articles(selected_articles)
+        # Get article content and generate the script, unless a resumed session already has it
+        stored_script = checkpoint.resumed("generate")
+        script = stored_script['output'] if stored_script else _write_script(client, feeds, condense_method)
 
-        # Generate and display script
-        while True:
-            script = _generate_script(client, scraped_articles)
-            approval = news_script.display_scrollable_script(script)
-            if(approval == 'q'):
-                break
-
-        _engagement_prompt(client, script)
-        news_script.save_script_to_file(script)
+        if checkpoint.resumed("score") is None:
+            _engagement_prompt(client, script)
+        if checkpoint.resumed("save") is None:
+            if news_script.save_script_to_file(script):
+                checkpoint.save("save", {'script': script}, True)
 
         # DALL-E generation
         _dalle_prompt(client, script)
+        checkpoint.finish_session()
 
         utils.wait_for_exit()
 
@@ -96,6 +111,24 @@ def _initialize_openai_api():
         else:
             utils._fatal_error(f"Unable to initialize OpenAI client. Please check your credentials and try again.")
 
+def _start_session(resume):
+    """Begin a new checkpointed session, or pick up the last unfinished one.
+
+    Args:
+        resume: Whether to look for an unfinished session
+    """
+    if not resume:
+        checkpoint.begin_session()
+        return
+    if not checkpoint.resume_session():
+        print_msg("No unfinished session to resume, starting a new one.")
+        checkpoint.begin_session()
+        time.sleep(2)
+        return
+    done = [stage for stage in checkpoint.STAGES if checkpoint.resumed(stage)]
+    print_msg(f"Resuming the last session, completed stages: {', '.join(done) or 'none'}.")
+    time.sleep(2)
+
 def _initialize_config():
     """Initialize feed configuration."""
     print_msg("Loading RSS config...")
@@ -105,6 +138,51 @@ def _initialize_config():
 
 # Content Collection Functions
 
+def _write_script(client, feeds, condense_method):
+    """Select articles, gather their content and generate an approved script.
+
+    Stages a resumed session completed are skipped, and each stage is
+    checkpointed as it finishes.
+
+    Args:
+        client: OpenAI client instance
+        feeds: Dictionary of RSS feeds and their configurations
+        condense_method: Optional name of a condense.METHODS entry used to digest articles first
+
+    Returns:
+        str: The approved script
+    """
+    scrape_results = None
+    if stored := checkpoint.resumed("scrape"):
+        selected_articles = _restore_articles(stored['output'])
+    else:
+        if stored := checkpoint.resumed("fetch"):
+            selected_articles = _restore_articles(stored['output'])
+        else:
+            selected_articles = _get_article_content(feeds)
+            checkpoint.save("fetch", selected_articles, selected_articles)
+        scrape_results, scrape_inputs = _scrape_articles(selected_articles)   # Keeps scraping while the prompt is written
+
+    # Generate and display script
+    variant = 0     # Each regenerate moves on to the next cached alternative
+    while True:
+        custom_prompt = _get_custom_prompt(selected_articles)
+        if scrape_results is not None:
+            selected_articles = scrape.collect_scraped_articles(scrape_results, len(selected_articles))
+            checkpoint.save("scrape", scrape_inputs, selected_articles)
+            scrape_results = None
+        if condense_method:          # Digests are kept, so regenerating reuses them
+            selected_articles = _condense_articles(client, selected_articles, condense_method)
+            condense_method = None
+        generate_inputs = {'articles': selected_articles, 'prompt': custom_prompt}
+        stored = checkpoint.load("generate", generate_inputs) if variant == 0 else None
+        approval, script = _generate_script(client, selected_articles, custom_prompt, variant,
+                                            stored['output'] if stored else None)
+        if(approval == 'q'):
+            checkpoint.save("generate", generate_inputs, script)
+            return script
+        variant += 1
+
 def _get_article_content(feeds):
     """Get articles either from RSS or manual input.
     
@@ -130,42 +208,62 @@ def _get_article_content(feeds):
             return articles.get_manual_article()
 
 def _scrape_articles(selected_articles):
+    """Ask how article content should be gathered and start any scraping in the background.
+
+    Args:
+        selected_articles: List of selected articles
+
+    Returns:
+        tuple: (queue.Queue of scrape results to collect later, or None if the
+               content is ready, inputs to checkpoint the collected results with)
+    """
     clear_buffer()
     print_msg("HINT: if you have manually inputted an article, just hit enter.")
     print_msg("There are multiple ways to use the content from your selected articles. They both have their pros and cons.")
     print_msg("1: Summary (DEFAULT): The summary of these articles will be fed to ChatGPT for usage, this is by far the fastest, but may miss context.")
-    print_msg("2: Newspaper4k Scraping: Each article will be scraped by url for it's content, some more complicated sites may not work with this method and it is slower.")
-    print_msg("3: Headless browser: Still not implemented.")
+    print_msg("2: Scraping: Each article will be scraped by url for it's content using a fast extractor, falling back to Newspaper4k. Some more complicated sites may not work with this method and it is slower.")
+    print_msg("3: Headless browser: Each article is rendered in a headless browser before its content is extracted. This works on sites that build their pages with JavaScript, but needs Playwright installed and is the slowest.")
 
     while True:
-        scrape_method = bgetstr("Please input your method [1]: ")
+        scrape_method = bgetstr("Please input your method [1]: ") or "1"
+        scrape_inputs = {'method': scrape_method, 'articles': list(selected_articles)}    # Copied before preparing in place
+        if scrape_method in ["1", "2", "3"] and (stored := checkpoint.load("scrape", scrape_inputs)):
+            print_msg("Reusing the article content gathered by an earlier run.")
+            selected_articles[:] = _restore_articles(stored['output'])
+            break
         match scrape_method:
-            case "":
-                break
             case "1":
+                for index, article in enumerate(selected_articles):     # Summaries get the same cleanup scraped text does
+                    selected_articles[index] = news_script.prepare_article(article)
                 break
             case "2":
-                selected_articles = scrape.scrape_article_content(selected_articles)
-                break
+                return scrape.start_scrape(selected_articles, prepare=news_script.prepare_article), scrape_inputs
             case "3":
-                bottom_win.print("STILL NOT IMPLEMENTED! Sorry :(")
-                time.sleep(2)
-                continue
+                if not render_pool.is_available():
+                    bottom_win.print(f"Playwright is not installed! Run: {render_pool.INSTALL_HINT}")
+                    time.sleep(2)
+                    continue
+                try:
+                    return scrape.start_scrape(selected_articles, headless=True, prepare=news_script.prepare_article), scrape_inputs
+                except Exception as e:          # Browser missing or failed to launch
+                    bottom_win.print(f"Headless browser failed to start: {e}")
+                    time.sleep(2)
+                    continue
             case _:
                 bottom_win.print("Invalid selection!")
                 time.sleep(2)
-    return selected_articles
+    checkpoint.save("scrape", scrape_inputs, selected_articles)
+    return None, scrape_inputs
             
 
-def _generate_script(client, selected_articles):
-    """Generate news script from selected articles.
+def _get_custom_prompt(selected_articles):
+    """Ask for an optional custom prompt, or export the selected articles.
     
     Args:
-        client: OpenAI client instance
-        selected_articles: List of articles to generate script from
+        selected_articles: List of selected articles, used for exporting
         
-    Raises:
-        Exception: If script generation fails
+    Returns:
+        str: Custom prompt, or an empty string for the default prompt
     """
     custom_prompt = ""
     clear_buffer()
@@ -190,16 +288,46 @@ def _generate_script(client, selected_articles):
             bottom_win.print("Invalid selection!")
             time.sleep(2)
             continue
+    return custom_prompt
 
+def _generate_script(client, selected_articles, custom_prompt, variant=0, stored_script=None):
+    """Generate news script from selected articles, showing it as it streams in.
+    
+    Args:
+        client: OpenAI client instance
+        selected_articles: List of articles to generate script from
+        custom_prompt: Custom prompt, or an empty string for the default prompt
+        variant: Which cached alternative to show, if the response cache is on
+        stored_script: Script approved by an earlier run with the same inputs, shown instead of generating
+        
+    Returns:
+        tuple: ('q' to keep the script or 'r' to regenerate it, script text)
+        
+    Raises:
+        Exception: If script generation fails
+    """
     bottom_win.print("Generating news anchor script...")
     try:
-        script = news_script.get_script(
-            client, selected_articles, custom_prompt)
-        return script
+        estimate = news_script.estimate_script_cost(selected_articles, custom_prompt)
+        note = f" ({estimate['prompt_tokens']:,}/{estimate['limit']:,} tokens, ~${estimate['cost']:.3f})"
+        if stored_script:
+            return news_script.display_streaming_script(iter([stored_script]), " (from checkpoint)")
+        return news_script.display_streaming_script(
+            news_script.stream_script(client, selected_articles, custom_prompt, variant), note)
     except Exception as e:
         utils._fatal_error(
             f"Unable to generate news script! caught exception: {str(e)}")
         
+def _condense_articles(client, selected_articles, method):
+    """Condense long articles in parallel, showing progress as each one finishes."""
+    clear_buffer()
+    print_msg(f"Condensing long articles ({method})...")
+    bottom_win.print("Condensing articles...")
+    def on_progress(done, total, article):
+        status = f"failed ({article['condense_error']})" if article.get('condense_error') else "done"
+        print_msg(f"[{done}/{total}] {article['title']}: {status}")
+    return condense.condense_articles(client, selected_articles, method, on_progress=on_progress)
+
 def _engagement_prompt(client,script):
     clear_buffer()
     print_msg("BETA: ednasg now supports content scoring, meaning that the script will be analyzed and scored on a few parameters.")
@@ -221,9 +349,13 @@ def _engagement_prompt(client,script):
                            ord('n'): (None, "break"),}
                           , True)
     if not choice:
+        checkpoint.save("score", {'script': script}, None)
         return
 
-    result = engagement.gpt_scoring(client, script)
+    stored = checkpoint.load("score", {'script': script})
+    result = stored['output'] if stored and stored['output'] else engagement.gpt_scoring(client, script)
+    if result is not None:
+        checkpoint.save("score", {'script': script}, result)
     news_script.display_scrollable_script(json.dumps(result))
 
 
@@ -243,7 +375,8 @@ def _export_articles(selected_articles):
         try:
             with open(filename, 'a', encoding='utf-8', errors='ignore') as f:
                 f.write(f"- {article['title']}\n")
-                f.write(f"Link: {utils.sanitize_output(article['url'])}\n")
+                f.write(f"ID: {article['id']}\n")
+                f.write(f"Link: {utils.sanitize_output(article['url'] or '')}\n")
                 f.write("\n")
         except IOError as e:
             print_msg(f"Error writing to file: {e}")
@@ -309,7 +442,15 @@ def _dalle_prompt(client, script):
                     bottom_win.print("Invalid selection!")
                     time.sleep(2)
 
-            dalle.generate_photos(client, script, num_images, image_quality, resolution)
+            image_inputs = {'script': script, 'count': num_images, 'quality': image_quality, 'resolution': resolution}
+            stored = checkpoint.load("images", image_inputs)
+            if stored and stored['output'] and all(os.path.exists(path) for path in stored['output']):
+                print_msg(f"These images were already generated: {', '.join(stored['output'])}")
+                bottom_win.bgetstr("Press any button to continue...")
+                break
+            paths = dalle.generate_photos(client, script, num_images, image_quality, resolution)
+            if paths is not None:
+                checkpoint.save("images", image_inputs, paths)
             break
         elif choice in ["n", ""]:
             break
@@ -317,6 +458,11 @@ def _dalle_prompt(client, script):
             bottom_win.print("Invalid selection!")
             time.sleep(2)
 
+def _restore_articles(stored):
+    """Turn checkpointed articles back into their in-memory form."""
+    return [{**article, 'date': time.struct_time(article['date']) if article.get('date') else article.get('date')}
+            for article in stored]
+
 # Display Functions
 
 def _display_welcome_message():
@@ -326,5 +472,117 @@ def _display_welcome_message():
     clear_buffer()
 
 
+# Command Line Functions
+
+def cli(argv=None):
+    """Command line entry point, runs the TUI unless a subcommand is given.
+    
+    Args:
+        argv: Optional argument list, defaults to sys.argv
+    """
+    args = _parse_args(argv)
+    llm_cache.enable(args.llm_cache)
+    token_budget.set_max_prompt_tokens(args.max_prompt_tokens)
+    match args.command:
+        case "poll":
+            poller.run(tag=args.tag, once=args.once)
+        case "opml":
+            _opml_command(args)
+        case "cache":
+            _cache_command(args)
+        case "run":
+            _run_command(args)
+        case "serve":
+            server.serve(_get_headless_client(), args.host, args.port, args.workers, args.queue_size, args.output_dir)
+        case _:
+            curses.wrapper(main, args.condense, args.resume)
+
+def _parse_args(argv):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog=utils.APP_NAME, description="Generate news anchor scripts from RSS feeds.")
+    parser.add_argument("--llm-cache", action="store_true",
+                        help="Reuse stored ChatGPT scripts for identical requests, 'r' cycles through stored alternatives.")
+    parser.add_argument("--max-prompt-tokens", type=int, default=token_budget.MAX_PROMPT_TOKENS,
+                        help="Trim article text so the script prompt stays under this many tokens.")
+    parser.add_argument("--condense", choices=sorted(condense.METHODS),
+                        help="Condense long articles before writing the script: 'gpt' with a cheap model, 'textrank' or 'lead' locally.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last unfinished session from its latest checkpoint.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    poll_parser = subparsers.add_parser("poll", help="Keep the local article store fresh by polling feeds in the background.")
+    poll_parser.add_argument("--tag", help="Only poll feeds with this tag.")
+    poll_parser.add_argument("--once", action="store_true", help="Poll every feed once and exit.")
+
+    opml_parser = subparsers.add_parser("opml", help="Import or export feeds as OPML.")
+    opml_parser.add_argument("action", choices=["import", "export"])
+    opml_parser.add_argument("path", help="OPML file to read or write.")
+    opml_parser.add_argument("--probe", action="store_true", help="Skip imported feeds that do not respond.")
+
+    run_parser = subparsers.add_parser("run", help="Generate scripts from job files without the TUI, printing JSON results.")
+    run_parser.add_argument("--job", action="append", required=True, help="YAML or JSON job file, may be repeated.")
+    run_parser.add_argument("--workers", type=int, default=batch.BATCH_WORKERS, help="Jobs run at once.")
+    run_parser.add_argument("--output", help="Write the JSON results here instead of to stdout.")
+
+    serve_parser = subparsers.add_parser("serve", help="Accept script jobs over a local HTTP API.")
+    serve_parser.add_argument("--host", default=server.SERVER_HOST, help="Address to listen on.")
+    serve_parser.add_argument("--port", type=int, default=server.SERVER_PORT, help="Port to listen on.")
+    serve_parser.add_argument("--workers", type=int, default=server.SERVER_WORKERS, help="Jobs run at once.")
+    serve_parser.add_argument("--queue-size", type=int, default=server.QUEUE_SIZE,
+                              help="Jobs allowed to wait for a worker before new ones are refused.")
+    serve_parser.add_argument("--output-dir", help="Directory jobs save scripts and images in, and may not write outside of.")
+
+    cache_parser = subparsers.add_parser("cache", help="Show statistics for, or clear, the ChatGPT response cache.")
+    cache_parser.add_argument("action", choices=["stats", "clear"])
+    return parser.parse_args(argv)
+
+def _opml_command(args):
+    """Run 'ednasg opml import|export' without the TUI."""
+    if args.action == "export":
+        print(f"Exported {opml.export_opml(args.path)} feeds to {args.path}.")
+        return
+    added, skipped = opml.import_opml(args.path, probe=args.probe)
+    for feed, reason in skipped:
+        print(f"Skipped {feed.get('url')}: {reason}")
+    print(f"Imported {len(added)} feeds, skipped {len(skipped)}.")
+
+def _run_command(args):
+    """Run 'ednasg run --job <file>' without the TUI."""
+    client = _get_headless_client()
+    try:
+        jobs = [job for path in args.job for job in batch.load_jobs(path)]
+    except Exception as e:
+        sys.exit(f"Invalid job file: {e}")
+    results = batch.run_jobs(client, jobs, workers=args.workers)
+    batch.dump_results(results, args.output)
+    if any(result['status'] != "ok" for result in results):
+        sys.exit(1)
+
+def _get_headless_client():
+    """Create an OpenAI client from the stored API key, exiting if there is none.
+
+    The API address can be pointed at another server, e.g. a local mock,
+    with the OPENAI_BASE_URL environment variable.
+    """
+    api_key = api_keyring.get_stored_api_key()
+    if not api_key:
+        sys.exit(f"No OpenAI API key found, set {api_keyring.API_KEY_ENV} or run the TUI once to store one.")
+    return OpenAI(api_key=api_key)
+
+def _cache_command(args):
+    """Run 'ednasg cache stats|clear' without the TUI."""
+    if args.action == "clear":
+        llm_cache.clear()
+        print("Cleared the response cache.")
+        return
+    stats = llm_cache.get_stats()
+    print(f"Stored responses: {stats['entries']} ({stats['bytes'] / 1024:.1f} KiB)")
+    print(f"Lookups: {stats['hits'] + stats['misses']:.0f}, hit rate {stats['hit_rate']:.0%}")
+    print(f"Spent on cached responses: ${stats['spent_dollars']:.4f}, saved by hits: ${stats['saved_dollars']:.4f}")
+    digests = stats['digests']
+    print(f"Condensed article digests: {digests['entries']}, hit rate {digests['hit_rate']:.0%}, "
+          f"saved by hits: ${digests['saved_dollars']:.4f}")
+
+
 if __name__ == "__main__":
-    curses.wrapper(main)
+    cli()
@@ -4,6 +4,46 @@ import json
 import utils
 
 def gpt_scoring(client, script):
+    saved_buffer = message_win.message_buffer
+    message_win.clear_buffer()
+    message_win.print_msg("Scoring news script...")
+
+    try:
+        response = _request_scoring(client, script)
+    except Exception as e:
+        utils.handle_openai_error(e, "GPT API call")
+        raise
+
+    _check_response(response)
+    message_win.print_msg("Parsing JSON results...")
+    try:
+        return _parse_scoring(response)
+    except Exception as e:
+        message_win.print_msg("Error parsing response:", e)
+        message_win.print_msg("Raw response:\n", response.choices[0].message.content.strip())
+        return None
+
+def score_script(client, script):
+    """Score a script for engagement without any user interaction.
+
+    Args:
+        client: OpenAI client instance
+        script: Script to score
+
+    Returns:
+        dict: Scores as returned by ChatGPT
+
+    Raises:
+        ValueError: If the response is not valid JSON
+        openai.OpenAIError: If the API call fails
+    """
+    response = _request_scoring(client, script)
+    _check_response(response)
+    return _parse_scoring(response)
+
+# Helpers
+def _request_scoring(client, script):
+    """Ask ChatGPT to score a script."""
     prompt = f"""
         Evaluate the following 99-second video script for engagement potential.
         Your output should be in json with the parameters
@@ -27,39 +67,28 @@ def gpt_scoring(client, script):
         Script:
         {script}
         """
-    
-    saved_buffer = message_win.message_buffer
-    message_win.clear_buffer()
-    message_win.print_msg("Scoring news script...")
 
-    try:
-        response = client.chat.completions.create(        # Get response from OpenAI API
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert content evaluator for 99 second news video scripts."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
-        )
-    except Exception as e:
-        utils.handle_openai_error(e, "GPT API call")
-        raise
+    return client.chat.completions.create(        # Get response from OpenAI API
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "You are an expert content evaluator for 99 second news video scripts."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7
+    )
 
+def _check_response(response):
+    """Raise if a scoring response is missing its content."""
     if not hasattr(response, 'choices') or not response.choices:          # Check response format
         raise ValueError("API response does not contain 'choices'")
     
     if not hasattr(response.choices[0], 'message') or not hasattr(response.choices[0].message, 'content'):
         raise ValueError("API response does not contain expected content")
 
-
-    message_win.print_msg("Parsing JSON results...")
-    try:
-        # Clean up the response by removing markdown code block markers
-        response_text = response.choices[0].message.content.strip()
-        # Remove ```json and ``` markers if present
-        response_text = response_text.replace('```json', '').replace('```', '').strip()
-        return json.loads(response_text)
-    except Exception as e:
-        message_win.print_msg("Error parsing response:", e)
-        message_win.print_msg("Raw response:\n", response.choices[0].message.content.strip())
-        return None
\ No newline at end of file
+def _parse_scoring(response):
+    """Extract the JSON scores from a scoring response."""
+    # Clean up the response by removing markdown code block markers
+    response_text = response.choices[0].message.content.strip()
+    # Remove ```json and ``` markers if present
+    response_text = response_text.replace('```json', '').replace('```', '').strip()
+    return json.loads(response_text)
@@ -0,0 +1,135 @@
+import re
+import lxml.html
+
+# Extraction Constants
+MIN_TEXT_LENGTH = 400           # Shorter fast-path results are treated as failures
+MIN_PARAGRAPHS = 3              # Fewer fast-path paragraphs are treated as failures
+MAX_LINK_DENSITY = 0.3          # Share of link text above which a block is boilerplate
+MIN_PARAGRAPH_LENGTH = 25       # Shorter paragraphs are dropped as captions and bylines
+SIBLING_SCORE_SHARE = 0.2       # Siblings scoring this share of the best element are kept with it
+MIN_SIBLING_SCORE = 10          # Siblings scoring less are never kept
+HEADING_TAGS = ('h2', 'h3')     # Subheadings kept in the text between paragraphs
+BOILERPLATE_TAGS = ('script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'svg')
+NEGATIVE_PATTERN = re.compile(r"comment|sidebar|footer|related|promo|share|social|advert|newsletter|subscri|contributor|menu", re.I)
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*>")     # lxml rejects str input with an encoding declaration
+POSITIVE_PATTERN = re.compile(r"article|body|content|entry|main|post|story|text", re.I)
+
+def extract_text(html, url):
+    """Extract article text, trying each extractor until one passes its quality check.
+
+    Args:
+        html: Downloaded page HTML
+        url: Page URL
+
+    Returns:
+        tuple: (article text, name of the extractor that produced it)
+    """
+    text = ""
+    for name, extractor, check in EXTRACTORS:
+        text = extractor(html, url)
+        if check(text):
+            return text, name
+    return text, name                               # Best effort from the last extractor
+
+def extract_lxml(html, url):
+    """Fast path: pick the element holding the most paragraph text, and its strong siblings, readability style.
+
+    Args:
+        html: Downloaded page HTML
+        url: Page URL
+
+    Returns:
+        str: Paragraphs of the best scoring element and kept siblings, separated by blank lines
+    """
+    try:
+        root = lxml.html.fromstring(XML_DECLARATION.sub('', html, count=1))
+    except (lxml.etree.ParserError, ValueError):
+        return ""
+    for element in list(root.iter(*BOILERPLATE_TAGS)):
+        if element.getparent() is not None:
+            element.drop_tree()
+
+    scores = {}
+    for paragraph in root.iter('p'):
+        text = paragraph.text_content().strip()
+        parent = paragraph.getparent()
+        if parent is None or len(text) < MIN_PARAGRAPH_LENGTH:
+            continue
+        scores[parent] = scores.get(parent, _class_weight(parent)) + 1 + text.count(',') + min(len(text) // 100, 3)
+        grandparent = parent.getparent()
+        if grandparent is not None:                 # Articles often wrap paragraphs in sections
+            scores[grandparent] = scores.get(grandparent, _class_weight(grandparent)) + 0.5
+    if not scores:
+        return ""
+
+    best = max(scores, key=scores.get)
+    threshold = max(MIN_SIBLING_SCORE, scores[best] * SIBLING_SCORE_SHARE)
+    parent = best.getparent()
+    blocks = [best] if parent is None else [    # Sections and live blog posts split the article into siblings
+        sibling for sibling in parent if sibling is best or scores.get(sibling, 0) >= threshold
+    ]
+    paragraphs = [
+        element.text_content().strip() for block in blocks for element in block.iter('p', *HEADING_TAGS)
+        if _is_article_text(element, block)
+    ]
+    return "\n\n".join(re.sub(r"\s+", " ", paragraph) for paragraph in paragraphs)
+
+def extract_newspaper(html, url):
+    """Slow path: run newspaper's full parser over already downloaded HTML.
+
+    Args:
+        html: Downloaded page HTML
+        url: Page URL
+
+    Returns:
+        str: Article text
+    """
+    import newspaper                                # Imported lazily, it is slow to load
+    news_article = newspaper.Article(url)
+    news_article.download(input_html=html)
+    news_article.parse()
+    return news_article.text
+
+def is_good_extraction(text):
+    """Check that fast-path output looks like a whole article rather than boilerplate.
+
+    Args:
+        text: Extracted text
+
+    Returns:
+        bool: True if the text is long enough and has enough paragraphs
+    """
+    return len(text) >= MIN_TEXT_LENGTH and text.count("\n\n") + 1 >= MIN_PARAGRAPHS
+
+# Extractors tried in order as (name, function, quality check)
+EXTRACTORS = [
+    ("lxml", extract_lxml, is_good_extraction),
+    ("newspaper", extract_newspaper, bool),
+]
+
+# Helpers
+def _class_weight(element):
+    """Score an element's class and id for article-like or boilerplate-like names."""
+    names = f"{element.get('class', '')} {element.get('id', '')}"
+    weight = 0
+    if NEGATIVE_PATTERN.search(names):
+        weight -= 25
+    if POSITIVE_PATTERN.search(names) or element.tag == 'article':
+        weight += 25
+    return weight
+
+def _is_article_text(element, block):
+    """Check that a paragraph or subheading inside a kept block is article text, not a widget or credit line."""
+    text = element.text_content().strip()
+    if len(text) < (1 if element.tag in HEADING_TAGS else MIN_PARAGRAPH_LENGTH) or _link_density(element) > MAX_LINK_DENSITY:
+        return False
+    while element is not None and element is not block:     # Newsletter boxes and the like sit inside the block
+        if NEGATIVE_PATTERN.search(f"{element.get('class', '')} {element.get('id', '')}"):
+            return False
+        element = element.getparent()
+    return True
+
+def _link_density(element):
+    """Get the share of an element's text that sits inside links."""
+    text_length = len(element.text_content()) or 1
+    return sum(len(link.text_content()) for link in element.iter('a')) / text_length
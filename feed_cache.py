@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import config
+
+# Cache Constants
+CACHE_DIR = 'feed_cache'                    # Directory next to the config file
+CACHE_TTL = 7 * 24 * 60 * 60                # Drop feeds not used for a week
+CACHE_MAX_BYTES = 50 * 1024 * 1024          # Total size cap for cached feeds
+EVICTION_INTERVAL = 60                      # Minimum seconds between eviction sweeps
+
+_eviction_lock = threading.Lock()
+_last_eviction = 0
+
+def load(url):
+    """Load the cached copy of a feed.
+
+    Args:
+        url: URL of the RSS feed
+
+    Returns:
+        dict: Cached entry with 'etag', 'modified', 'fetched' and 'articles', or None
+    """
+    path = _get_entry_path(url)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if entry.get('url') != url or time.time() - entry.get('fetched', 0) > CACHE_TTL:
+        return None
+
+    try:
+        os.utime(path)                              # Eviction reads the mtime as the last access
+    except OSError:
+        pass
+    entry['articles'] = [_decode_article(article) for article in entry.get('articles', [])]
+    return entry
+
+def conditional_headers(entry):
+    """Build conditional request headers from a cached entry.
+
+    Args:
+        entry: Cached entry returned by load(), or None
+
+    Returns:
+        dict: If-None-Match / If-Modified-Since headers
+    """
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('modified'):
+        headers['If-Modified-Since'] = entry['modified']
+    return headers
+
+def store(url, etag, modified, articles):
+    """Save a freshly parsed feed to the cache.
+
+    Args:
+        url: URL of the RSS feed
+        etag: ETag response header, if any
+        modified: Last-Modified response header, if any
+        articles: Articles extracted from the feed
+    """
+    entry = {
+        'url': url,
+        'etag': etag,
+        'modified': modified,
+        'fetched': time.time(),
+        'articles': [_encode_article(article) for article in articles]
+    }
+    _write_entry(url, entry)
+    _maybe_evict()
+
+def touch(url):
+    """Mark a cached feed as still valid after a 304 Not Modified response.
+
+    Args:
+        url: URL of the RSS feed
+    """
+    path = _get_entry_path(url)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        entry['fetched'] = time.time()
+        _write_entry(url, entry)
+    except (OSError, ValueError):
+        pass
+
+def evict():
+    """Remove expired entries, then the least recently used ones until under the size cap."""
+    cache_dir = _get_cache_dir()
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+
+    now = time.time()
+    files = []
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if now - stat.st_mtime > CACHE_TTL:        # Expired
+            _remove(path)
+        else:
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):            # Least recently used first
+        if total <= CACHE_MAX_BYTES:
+            break
+        _remove(path)
+        total -= size
+
+# Helpers
+def _get_cache_dir():
+    """Get the cache directory, creating it if needed."""
+    cache_dir = config.get_data_path(CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def _get_entry_path(url):
+    """Get the cache file path for a feed URL."""
+    return os.path.join(_get_cache_dir(), hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+def _write_entry(url, entry):
+    """Atomically write a cache entry to disk."""
+    path = _get_entry_path(url)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+def _maybe_evict():
+    """Run an eviction sweep if the last one is old enough."""
+    global _last_eviction
+    with _eviction_lock:
+        if time.time() - _last_eviction < EVICTION_INTERVAL:
+            return
+        _last_eviction = time.time()
+    evict()
+
+def _remove(path):
+    """Remove a cache file, ignoring races with other processes."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _encode_article(article):
+    """Convert an article to a JSON-safe dictionary."""
+    return {**article, 'date': list(article['date']) if article.get('date') else None}
+
+def _decode_article(article):
+    """Convert a cached article back to its in-memory form."""
+    return {**article, 'date': time.struct_time(article['date']) if article.get('date') else time.gmtime(0)}
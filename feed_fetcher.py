@@ -0,0 +1,143 @@
+import time
+import feedparser
+import http_client
+import feed_cache
+import article_store
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Fetch Constants
+FETCH_WORKERS = 16          # Maximum number of feeds fetched at once
+FETCH_TIMEOUT = 10          # Per-feed timeout in seconds
+USER_AGENT = "ednasg feed fetcher"
+
+def fetch_feed(url, timeout=FETCH_TIMEOUT):
+    """Download and parse a single RSS feed.
+
+    Conditional requests are made from the on-disk feed cache, so an
+    unchanged feed costs a single 304 round trip and is never re-parsed.
+
+    Args:
+        url: URL of the RSS feed
+        timeout: Seconds to wait for the feed before giving up
+
+    Returns:
+        list: Articles extracted from the feed
+
+    Raises:
+        ValueError: If the feed could not be parsed
+        httpx.HTTPError: If the feed could not be downloaded
+    """
+    cached = feed_cache.load(url)
+    headers = {"User-Agent": USER_AGENT, **feed_cache.conditional_headers(cached)}
+    response = http_client.get(url, timeout=timeout, headers=headers)
+    if response.status_code == 304 and cached:     # Not modified, reuse parsed entries
+        feed_cache.touch(url)
+        for article in cached['articles']:          # Entries cached by older versions lack a feed or current ID
+            article.setdefault('feed', url)
+            article['id'] = article_store.article_id(article)
+        return cached['articles']
+    response.raise_for_status()
+
+    feed = feedparser.parse(response.content)
+    if feed.bozo and not feed.entries:
+        raise ValueError(f"invalid feed: {feed.get('bozo_exception', 'unknown error')}")
+    articles = extract_articles(feed, url)
+    feed_cache.store(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), articles)
+    return articles
+
+def fetch_feeds(urls, workers=FETCH_WORKERS, timeout=FETCH_TIMEOUT):
+    """Fetch several RSS feeds concurrently and merge their articles.
+
+    Each feed is fetched on a bounded thread pool, so the total time is close
+    to the slowest single feed rather than the sum of all of them.
+
+    Args:
+        urls: List of feed URLs
+        workers: Maximum number of concurrent fetches
+        timeout: Per-feed timeout in seconds
+
+    Returns:
+        tuple: (articles sorted newest first, dict of {url: error} for failed feeds)
+    """
+    results, errors = fetch_each_feed(urls, workers, timeout)
+    articles = [article for feed_articles in results.values() for article in feed_articles]
+    return sort_articles(articles), errors
+
+def fetch_each_feed(urls, workers=FETCH_WORKERS, timeout=FETCH_TIMEOUT):
+    """Fetch several RSS feeds concurrently, keeping each feed's articles separate.
+
+    Args:
+        urls: List of feed URLs
+        workers: Maximum number of concurrent fetches
+        timeout: Per-feed timeout in seconds
+
+    Returns:
+        tuple: (dict of {url: articles}, dict of {url: error} for failed feeds)
+    """
+    urls = list(dict.fromkeys(urls))      # Drop duplicate URLs, keep order
+    results, errors = {}, {}
+    if not urls:
+        return results, errors
+
+    # No deadline for the whole batch: feeds queued behind others would time out
+    # before they start. Each fetch is bounded by its own request timeout instead.
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as executor:
+        futures = {executor.submit(fetch_feed, url, timeout): url for url in urls}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                errors[futures[future]] = e
+
+    return results, errors
+
+def probe_feeds(urls, workers=FETCH_WORKERS, timeout=FETCH_TIMEOUT):
+    """Check concurrently which feed URLs respond successfully.
+
+    Args:
+        urls: List of feed URLs
+        workers: Maximum number of concurrent requests
+        timeout: Per-feed timeout in seconds
+
+    Returns:
+        dict: {url: error message} for each unreachable feed
+    """
+    failures = {}
+    if not urls:
+        return failures
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as executor:
+        futures = {executor.submit(http_client.head_ok, url, timeout): url for url in urls}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures[futures[future]] = str(e)
+    return failures
+
+def extract_articles(feed, feed_url=None):
+    """Extract article data from parsed feed entries.
+
+    Args:
+        feed: A feedparser result
+        feed_url: URL the feed was fetched from
+
+    Returns:
+        list: Article dictionaries
+    """
+    articles = [
+        {'date': _entry_date(entry), 'title': entry.get('title', ''), 'summary': entry.get('summary', ''),
+         'url': entry.get('link'), 'feed': feed_url, 'guid': entry.get('id')}
+        for entry in feed.entries
+    ]
+    for article in articles:
+        article['id'] = article_store.article_id(article)
+    return articles
+
+def sort_articles(articles):
+    """Sort articles newest first, undated articles last."""
+    return sorted(articles, key=lambda article: article['date'] or time.gmtime(0), reverse=True)
+
+# Helpers
+def _entry_date(entry):
+    """Get the best available date for a feed entry."""
+    return entry.get('updated_parsed') or entry.get('published_parsed') or time.gmtime(0)
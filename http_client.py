@@ -0,0 +1,131 @@
+import threading
+import time
+from urllib.parse import urlsplit
+import httpx
+import resilience
+
+try:
+    import h2               # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:         # Optional dependency, falls back to HTTP/1.1 keep-alive
+    HTTP2_AVAILABLE = False
+
+# HTTP Constants
+USER_AGENT = "Mozilla/5.0 (compatible; ednasg)"
+DEFAULT_TIMEOUT = 15                        # Seconds per request
+CONNECT_TIMEOUT = 5                         # Dead hosts fail here instead of waiting out the full timeout
+MAX_CONNECTIONS = 64                        # Open connections across every host
+MAX_KEEPALIVE = 32                          # Idle connections kept for reuse
+KEEPALIVE_EXPIRY = 60                       # Seconds an idle connection is kept
+PER_HOST_LIMIT = 4                          # Maximum concurrent requests to a single host
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024       # Larger bodies are abandoned, e.g. a PDF or video behind a link
+MAX_IMAGE_BYTES = 20 * 1024 * 1024          # Cap for generated image downloads
+BODY_TIMEOUT_FACTOR = 2                     # A body trickling in for longer than this many timeouts is abandoned
+
+_client = None
+_client_lock = threading.Lock()
+_host_locks = {}
+_host_locks_lock = threading.Lock()
+
+class ResponseTooLarge(ValueError):
+    """Raised when a response body exceeds its size cap."""
+
+def get(url, timeout=DEFAULT_TIMEOUT, headers=None, max_bytes=MAX_RESPONSE_BYTES, attempts=resilience.MAX_ATTEMPTS):
+    """Download a URL on the shared connection pool.
+
+    The body is streamed and abandoned as soon as it passes max_bytes.
+    Compressed responses (gzip, deflate, and brotli if installed) are
+    decoded transparently. Failed tries are retried with backoff, and hosts
+    that keep failing are skipped, see resilience.call.
+
+    Args:
+        url: URL to download
+        timeout: Seconds to wait for the server, each try is abandoned after
+                 BODY_TIMEOUT_FACTOR times this in total
+        headers: Optional extra request headers
+        max_bytes: Largest decoded body accepted
+        attempts: Tries before giving up
+
+    Returns:
+        httpx.Response: Response with its body read; the status is not checked
+
+    Raises:
+        ResponseTooLarge: If the body is larger than max_bytes
+        resilience.HostUnavailable: If the host has been failing
+        httpx.HTTPError: If the request fails
+    """
+    def send():
+        with _get_host_lock(url):
+            deadline = time.monotonic() + timeout * BODY_TIMEOUT_FACTOR     # Counted from when this try starts
+            with get_client().stream("GET", url, timeout=_timeout(timeout), headers=headers) as response:
+                declared = response.headers.get('Content-Length')
+                if declared and declared.isdigit() and int(declared) > max_bytes:
+                    raise ResponseTooLarge(f"response is {int(declared)} bytes, limit is {max_bytes}")
+                chunks, size = [], 0
+                for chunk in response.iter_bytes():
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ResponseTooLarge(f"response exceeds {max_bytes} bytes")
+                    if time.monotonic() > deadline:
+                        raise httpx.ReadTimeout(f"response took longer than {timeout * BODY_TIMEOUT_FACTOR} seconds",
+                                                request=response.request)
+                    chunks.append(chunk)
+
+        response_headers = [(key, value) for key, value in response.headers.multi_items()
+                            if key.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+        return httpx.Response(response.status_code, headers=response_headers, content=b"".join(chunks),
+                              request=response.request, extensions=response.extensions)
+    return resilience.call(url, send, attempts)
+
+def head_ok(url, timeout=DEFAULT_TIMEOUT):
+    """Check that a URL responds successfully, reading only its headers.
+
+    Args:
+        url: URL to check
+        timeout: Seconds to wait for the server
+
+    Raises:
+        resilience.HostUnavailable: If the host has been failing
+        httpx.HTTPError: If the request fails or returns an error status
+    """
+    def send():
+        with _get_host_lock(url):
+            with get_client().stream("GET", url, timeout=_timeout(timeout)) as response:
+                return response
+    resilience.call(url, send, attempts=1).raise_for_status()
+
+def get_client():
+    """Get the shared client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE,
+                                    keepalive_expiry=KEEPALIVE_EXPIRY),
+                timeout=DEFAULT_TIMEOUT,
+            )
+        return _client
+
+def close():
+    """Close the shared client and its pooled connections."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+# Helpers
+def _timeout(timeout):
+    """Build a timeout that gives up on unreachable hosts sooner than on slow ones."""
+    return httpx.Timeout(timeout, connect=min(timeout, CONNECT_TIMEOUT))
+
+def _get_host_lock(url):
+    """Get the semaphore limiting concurrent requests to a URL's host."""
+    host = urlsplit(url).netloc.lower()
+    with _host_locks_lock:
+        if host not in _host_locks:
+            _host_locks[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_locks[host]
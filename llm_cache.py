@@ -0,0 +1,254 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import config
+import pricing
+
+# Cache Constants
+CACHE_FILE = 'llm_cache.db'                     # SQLite database next to the config file
+CACHE_MAX_BYTES = 20 * 1024 * 1024              # Total size cap for stored responses
+DIGEST_MAX_BYTES = 20 * 1024 * 1024             # Separate cap for condensed article digests
+EVICTION_INTERVAL = 20                          # Check the size cap every this many writes
+
+_enabled = False        # Opt-in for scripts, see enable(); digests are always cached
+_local = threading.local()
+_write_count = 0
+_write_count_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT NOT NULL,
+    variant INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    model TEXT NOT NULL,
+    cost REAL NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (key, variant)
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS digests (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    model TEXT NOT NULL,
+    cost REAL NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_digests_accessed ON digests (accessed);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+def enable(enabled=True):
+    """Turn the cache on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+def is_enabled():
+    """Check whether responses are being cached."""
+    return _enabled
+
+def cache_key(model, temperature, messages, seed=0):
+    """Hash everything that determines a completion.
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        messages: Chat messages sent
+        seed: Slot for keeping otherwise identical requests apart
+
+    Returns:
+        str: Cache key
+    """
+    payload = json.dumps([model, temperature, messages, seed], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def get(key, variant=0):
+    """Get a stored response, counting the lookup as a hit or a miss.
+
+    Args:
+        key: Key from cache_key()
+        variant: Which of the stored alternatives to return
+
+    Returns:
+        str: Response text, or None if that variant has not been stored
+    """
+    conn = _get_connection()
+    row = conn.execute("SELECT content, cost FROM responses WHERE key = ? AND variant = ?", (key, variant)).fetchone()
+    with conn:
+        if row is None:
+            _add_stats(conn, misses=1)
+            return None
+        conn.execute("UPDATE responses SET accessed = ? WHERE key = ? AND variant = ?", (time.time(), key, variant))
+        _add_stats(conn, hits=1, saved_dollars=row[1])
+    return row[0]
+
+def put(key, content, model, prompt_tokens=0, completion_tokens=0):
+    """Store a response as the next variant for its key.
+
+    Storing is best effort: a database error is swallowed, so a response
+    that has already been paid for is never lost to a cache failure.
+
+    Args:
+        key: Key from cache_key()
+        content: Response text
+        model: Model that produced it
+        prompt_tokens: Tokens sent, for cost accounting
+        completion_tokens: Tokens received, for cost accounting
+
+    Returns:
+        int: Variant number the response was stored under, or None if it could not be stored
+    """
+    cost = pricing.estimate_cost(model, prompt_tokens, completion_tokens)
+    now = time.time()
+    conn = _get_connection()
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")         # Hold the write lock from picking the variant to inserting it
+            conn.execute("""
+                INSERT INTO responses (key, variant, content, model, cost, size, created, accessed)
+                SELECT ?, COALESCE(MAX(variant) + 1, 0), ?, ?, ?, ?, ?, ? FROM responses WHERE key = ?
+            """, (key, content, model, cost, len(content.encode('utf-8')), now, now, key))
+            variant = conn.execute("SELECT MAX(variant) FROM responses WHERE key = ?", (key,)).fetchone()[0]
+            _add_stats(conn, spent_dollars=cost)
+        _count_write()
+    except sqlite3.Error:
+        return None
+    return variant
+
+def get_digest(key):
+    """Get a stored article digest, counting the lookup apart from script lookups.
+
+    Digests are cached whether or not the script cache is enabled, since an
+    article's digest does not change between runs.
+
+    Args:
+        key: Key from cache_key()
+
+    Returns:
+        str: Digest, or None if it has not been stored
+    """
+    conn = _get_connection()
+    row = conn.execute("SELECT content, cost FROM digests WHERE key = ?", (key,)).fetchone()
+    with conn:
+        if row is None:
+            _add_stats(conn, digest_misses=1)
+            return None
+        conn.execute("UPDATE digests SET accessed = ? WHERE key = ?", (time.time(), key))
+        _add_stats(conn, digest_hits=1, digest_saved_dollars=row[1])
+    return row[0]
+
+def put_digest(key, content, model, prompt_tokens=0, completion_tokens=0):
+    """Store an article digest, replacing any earlier one for the key, ignoring database errors.
+
+    Args:
+        key: Key from cache_key()
+        content: Digest text
+        model: Model that produced it
+        prompt_tokens: Tokens sent, for cost accounting
+        completion_tokens: Tokens received, for cost accounting
+    """
+    cost = pricing.estimate_cost(model, prompt_tokens, completion_tokens)
+    now = time.time()
+    try:
+        with _get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO digests (key, content, model, cost, size, created, accessed)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (key, content, model, cost, len(content.encode('utf-8')), now, now))
+            _add_stats(conn, digest_spent_dollars=cost)
+        _count_write()
+    except sqlite3.Error:                           # Best effort, like put()
+        pass
+
+def count_variants(key):
+    """Get how many alternatives are stored for a key."""
+    return _get_connection().execute("SELECT COUNT(*) FROM responses WHERE key = ?", (key,)).fetchone()[0]
+
+def evict():
+    """Remove the least recently used responses and digests until each is under its size cap."""
+    with _get_connection() as conn:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        stale = []
+        if total > CACHE_MAX_BYTES:
+            for key, variant, size in conn.execute("SELECT key, variant, size FROM responses ORDER BY accessed"):
+                if total <= CACHE_MAX_BYTES:
+                    break
+                stale.append((key, variant))
+                total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ? AND variant = ?", stale)
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM digests").fetchone()[0]
+        stale = []
+        if total > DIGEST_MAX_BYTES:
+            for key, size in conn.execute("SELECT key, size FROM digests ORDER BY accessed"):
+                if total <= DIGEST_MAX_BYTES:
+                    break
+                stale.append((key,))
+                total -= size
+        conn.executemany("DELETE FROM digests WHERE key = ?", stale)
+
+def get_stats():
+    """Get cache statistics for scripts, with the digest statistics kept apart.
+
+    Returns:
+        dict: 'hits', 'misses', 'hit_rate', 'saved_dollars', 'spent_dollars',
+              'entries' and 'bytes' for scripts, and 'digests' with the same
+              keys for condensed article digests
+    """
+    conn = _get_connection()
+    counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+    stats = _summarize_stats(counters, "", conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone())
+    stats['digests'] = _summarize_stats(counters, "digest_", conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM digests").fetchone())
+    return stats
+
+def clear():
+    """Delete every stored response and digest and reset the statistics."""
+    with _get_connection() as conn:
+        conn.execute("DELETE FROM responses")
+        conn.execute("DELETE FROM digests")
+        conn.execute("DELETE FROM stats")
+
+# Helpers
+def _get_connection():
+    """Get this thread's connection to the cache, creating the schema on first use."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(config.get_data_path(CACHE_FILE), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+def _count_write():
+    """Count a write, running eviction every EVICTION_INTERVAL writes."""
+    global _write_count
+    with _write_count_lock:
+        _write_count += 1
+        due = _write_count % EVICTION_INTERVAL == 1
+    if due:
+        evict()
+
+def _summarize_stats(counters, prefix, size_row):
+    """Build one set of statistics from the raw counters with a name prefix."""
+    stats = {name: counters.get(prefix + name, 0) for name in ('hits', 'misses', 'saved_dollars', 'spent_dollars')}
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    stats['entries'], stats['bytes'] = size_row
+    return stats
+
+def _add_stats(conn, **increments):
+    """Add to named counters inside the caller's transaction."""
+    conn.executemany("""
+        INSERT INTO stats (name, value) VALUES (?, ?)
+        ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+    """, increments.items())
@@ -1,35 +1,143 @@
 import curses
+import queue
+import threading
 import message_win
 import bottom_win
 import screen_manager
 import utils
+import dedup
+import llm_cache
+import token_budget
+import openai
 from openai import OpenAI
 import time
 
 DEFAULT_GPT_PROMPT = "Create a 99-second news anchor script for the following articles:"
+SCRIPT_MODEL = "gpt-4o"
+SCRIPT_TEMPERATURE = 0.7
+MAX_ARTICLE_CHARS = 8000        # Longer article text is cut at a paragraph boundary before prompting
+STREAM_POLL_INTERVAL = 0.03     # Seconds between checks for new text and keys while streaming
 
-def get_script(client, articles, custom_prompt):      # Generate news script using ChatGPT
-    """Generate a news anchor script using ChatGPT based on the provided articles."""
-    _validate_articles(articles)
-    messages = _create_gpt_messages(articles, custom_prompt)
-    
+def get_script(client, articles, custom_prompt, variant=0):      # Generate news script using ChatGPT
+    """Generate a news anchor script using ChatGPT based on the provided articles, reporting API errors."""
     try:
-        response = client.chat.completions.create(        # Get response from OpenAI API
-            model="gpt-4o",
-            messages=messages,
-            temperature=0.7
-        )
-    except Exception as e:
+        return generate_script(client, articles, custom_prompt, variant)
+    except openai.OpenAIError as e:
         utils.handle_openai_error(e, "GPT API call")
         raise
 
+def generate_script(client, articles, custom_prompt, variant=0):
+    """Generate a news anchor script without any user interaction.
+
+    With the response cache enabled, a stored script for the same messages is
+    returned without an API call.
+
+    Args:
+        client: OpenAI client instance
+        articles: List of articles to generate the script from
+        custom_prompt: Custom prompt, or an empty string for the default prompt
+        variant: Which stored alternative to reuse, a new one is generated if missing
+
+    Returns:
+        str: The script
+
+    Raises:
+        ValueError: If the articles or the API response are malformed
+        openai.OpenAIError: If the API call fails
+    """
+    _validate_articles(articles)
+    messages = _create_gpt_messages(articles, custom_prompt)
+    cache_key = llm_cache.cache_key(SCRIPT_MODEL, SCRIPT_TEMPERATURE, messages) if llm_cache.is_enabled() else None
+    if cache_key and (cached := llm_cache.get(cache_key, variant)) is not None:
+        return cached
+
+    response = client.chat.completions.create(        # Get response from OpenAI API
+        model=SCRIPT_MODEL,
+        messages=messages,
+        temperature=SCRIPT_TEMPERATURE
+    )
+
     if not hasattr(response, 'choices') or not response.choices:          # Check response format
         raise ValueError("API response does not contain 'choices'")
     
     if not hasattr(response.choices[0], 'message') or not hasattr(response.choices[0].message, 'content'):
         raise ValueError("API response does not contain expected content")
 
-    return response.choices[0].message.content.strip()
+    script = response.choices[0].message.content.strip()
+    if cache_key:
+        usage = getattr(response, 'usage', None)
+        llm_cache.put(cache_key, script, SCRIPT_MODEL, getattr(usage, 'prompt_tokens', 0), getattr(usage, 'completion_tokens', 0))
+    return script
+
+def stream_script(client, articles, custom_prompt, variant=0):
+    """Generate a news anchor script with ChatGPT, yielding text as it arrives.
+
+    With the response cache enabled, a stored script is yielded whole instead
+    of calling the API, and a completed stream is stored as a new variant.
+
+    Args:
+        client: OpenAI client instance
+        articles: List of articles to generate the script from
+        custom_prompt: Custom prompt, or an empty string for the default prompt
+        variant: Which stored alternative to reuse, a new one is generated if missing
+
+    Returns:
+        generator: Pieces of script text in order
+    """
+    _validate_articles(articles)
+    messages = _create_gpt_messages(articles, custom_prompt)
+    cache_key = llm_cache.cache_key(SCRIPT_MODEL, SCRIPT_TEMPERATURE, messages) if llm_cache.is_enabled() else None
+    if cache_key and (cached := llm_cache.get(cache_key, variant)) is not None:
+        yield cached
+        return
+
+    stream = client.chat.completions.create(
+        model=SCRIPT_MODEL,
+        messages=messages,
+        temperature=SCRIPT_TEMPERATURE,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    pieces, usage = [], None
+    with stream:                                    # Closing early drops the connection
+        for chunk in stream:
+            usage = chunk.usage or usage            # Only the final chunk carries usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                pieces.append(chunk.choices[0].delta.content)
+                yield pieces[-1]
+    if cache_key:                                   # Only reached when the stream ran to the end
+        llm_cache.put(cache_key, "".join(pieces).strip(), SCRIPT_MODEL,
+                      getattr(usage, 'prompt_tokens', 0), getattr(usage, 'completion_tokens', 0))
+
+def estimate_script_cost(articles, custom_prompt):
+    """Project the prompt size and cost of generating a script, without calling the API.
+
+    Args:
+        articles: List of articles to generate the script from
+        custom_prompt: Custom prompt, or an empty string for the default prompt
+
+    Returns:
+        dict: 'prompt_tokens', 'limit' and 'cost' in US dollars
+    """
+    return token_budget.estimate_prompt_cost(_create_gpt_messages(articles, custom_prompt), SCRIPT_MODEL)
+
+def prepare_article(article):
+    """Clean up one article for the prompt, cheap enough to run as each article lands.
+
+    Args:
+        article: Article dictionary
+
+    Returns:
+        dict: Article with whitespace collapsed and over-long text truncated
+    """
+    summary = "\n\n".join(
+        " ".join(paragraph.split()) for paragraph in (article.get('summary') or "").split("\n\n") if paragraph.strip()
+    )
+    if len(summary) > MAX_ARTICLE_CHARS:
+        cut = summary.rfind("\n\n", 0, MAX_ARTICLE_CHARS)
+        summary = summary[:cut if cut > 0 else MAX_ARTICLE_CHARS]
+    token_budget.count_tokens(summary, SCRIPT_MODEL)     # Counted now, so fitting the prompt later is free
+    return {**article, 'summary': summary}
 
 def display_scrollable_script(script):
     """Display the script in a scrollable window with user controls."""
@@ -41,16 +149,9 @@ def display_scrollable_script(script):
         bottom_win.print("Use UP/DOWN keys or mouse wheel to scroll, 'q' to quit, 'r' to return.")
         _display_script(script, script_scroll_idx)
         
-        ch = bottom_win.getch()
-        if utils.IS_WINDOWS and ch == curses.KEY_MOUSE:
-            try:
-                mouse_event = curses.getmouse()
-                if mouse_event[4] & utils.MOUSE_UP:
-                    ch = curses.KEY_UP
-                elif mouse_event[4] & utils.MOUSE_DOWN:
-                    ch = curses.KEY_DOWN
-            except curses.error:
-                continue
+        ch = _translate_mouse(bottom_win.getch())
+        if ch is None:
+            continue
                 
         if ch == ord('q'):
             return 'q'
@@ -59,6 +160,80 @@ def display_scrollable_script(script):
             
         script_scroll_idx = _handle_scroll_input(ch, script_scroll_idx, wrapped_lines)
 
+def display_streaming_script(chunks, note=""):
+    """Display a script while it streams in, wrapping each piece as it arrives.
+
+    The user can scroll, cancel or regenerate before the stream finishes. The
+    view follows new text until the user scrolls away from the bottom.
+
+    Args:
+        chunks: Iterable of script text pieces, e.g. from stream_script
+        note: Optional text shown in the status bar while generating
+
+    Returns:
+        tuple: ('q' or 'r', script text received)
+
+    Raises:
+        Exception: If the stream fails
+    """
+    output = queue.Queue()
+    cancelled = threading.Event()
+    threading.Thread(target=_consume_stream, args=(chunks, output, cancelled), daemon=True).start()
+
+    script = ""
+    max_width = message_win.win.getmaxyx()[1] - 1
+    wrapped_lines = [""]
+    scroll_idx, follow, streaming, changed = 0, True, True, True
+    bottom_win.win.nodelay(True)
+    try:
+        while True:
+            while streaming:                        # Take everything that arrived since the last pass
+                try:
+                    item = output.get_nowait()
+                except queue.Empty:
+                    break
+                changed = True
+                if item is None:
+                    streaming = False
+                elif isinstance(item, Exception):
+                    utils.handle_openai_error(item, "GPT API call")
+                    raise item
+                else:
+                    script += item
+                    _append_wrapped(wrapped_lines, item, max_width)
+
+            if changed:
+                max_lines = message_win.win.getmaxyx()[0] - 1
+                if follow:
+                    scroll_idx = max(0, len(wrapped_lines) - max_lines)
+                status = (f"Generating{note}... UP/DOWN to scroll, 'c' to cancel, 'r' to regenerate, 'q' to quit."
+                          if streaming else "Use UP/DOWN keys or mouse wheel to scroll, 'q' to quit, 'r' to return.")
+                bottom_win.print(status)
+                _display_lines(wrapped_lines, scroll_idx)
+                changed = False
+
+            ch = _translate_mouse(bottom_win.getch())
+            if ch is None or ch == -1:
+                time.sleep(STREAM_POLL_INTERVAL)
+                continue
+            if ch in (ord('q'), ord('r')):
+                return chr(ch), script
+            if ch == ord('c') and streaming:
+                cancelled.set()
+                streaming, changed = False, True
+                continue
+
+            scroll_idx = _handle_scroll_input(ch, scroll_idx, wrapped_lines)
+            if ch == curses.KEY_RESIZE:             # Width changed, wrap everything again
+                max_width = message_win.win.getmaxyx()[1] - 1
+                wrapped_lines = _wrap_text(script, max_width)
+            else:                                   # Follow new text only while at the bottom
+                follow = scroll_idx >= len(wrapped_lines) - (message_win.win.getmaxyx()[0] - 1)
+            changed = True
+    finally:
+        cancelled.set()                             # Stop the stream if it is still running
+        bottom_win.win.nodelay(False)
+
 def get_save_filename():                              # Prompt for save location
     """Get the filename from user input with default option."""
     default_filename = "news_script.txt"
@@ -106,10 +281,13 @@ def save_script_to_file(script):                      # Main save function
 def _display_script(script, start_idx=0):             # Show current script view
     """Display the current portion of the script in the window."""
     height, width = message_win.win.getmaxyx()
-    max_lines = height - 1                            # Reserve bottom line
     max_width = width - 1                             # Account for borders
-    wrapped_lines = _wrap_text(script, max_width)
+    _display_lines(_wrap_text(script, max_width), start_idx)
 
+def _display_lines(wrapped_lines, start_idx=0):       # Show already wrapped lines
+    """Display a window's worth of wrapped lines starting at start_idx."""
+    height, width = message_win.win.getmaxyx()
+    max_lines = height - 1                            # Reserve bottom line
     end_idx = min(start_idx + max_lines, len(wrapped_lines))
     
     message_win.win.erase()
@@ -128,6 +306,44 @@ def _wrap_text(text, max_width):                      # Handle text wrapping
         wrapped_lines.append(line)
     return wrapped_lines
 
+def _append_wrapped(wrapped_lines, text, max_width):  # Extend wrapping in place
+    """Wrap newly arrived text onto existing wrapped lines, same as wrapping the whole text."""
+    for i, part in enumerate(text.split('\n')):
+        if i:
+            wrapped_lines.append("")
+        line = wrapped_lines.pop() + part
+        while len(line) > max_width:                  # Only the last line can grow
+            wrapped_lines.append(line[:max_width])
+            line = line[max_width:]
+        wrapped_lines.append(line)
+
+def _consume_stream(chunks, output, cancelled):      # Runs on a background thread
+    """Move streamed text onto a queue, then None, stopping early if cancelled."""
+    try:
+        for text in chunks:
+            if cancelled.is_set():
+                break
+            output.put(text)
+    except Exception as e:
+        output.put(e)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+        output.put(None)
+
+def _translate_mouse(ch):                             # Map wheel events to arrow keys
+    """Turn Windows mouse wheel events into arrow keys, or None for other mouse events."""
+    if utils.IS_WINDOWS and ch == curses.KEY_MOUSE:
+        try:
+            mouse_event = curses.getmouse()
+        except curses.error:
+            return None
+        if mouse_event[4] & utils.MOUSE_UP:
+            return curses.KEY_UP
+        elif mouse_event[4] & utils.MOUSE_DOWN:
+            return curses.KEY_DOWN
+    return ch
+
 def _validate_articles(articles):                      # Verify article format
     """Validate the structure of the articles list."""
     if not isinstance(articles, list):
@@ -138,10 +354,14 @@ def _validate_articles(articles):                      # Verify article format
             raise ValueError("Each article should be a dictionary with 'title' and 'summary' keys")
 
 def _create_gpt_messages(articles, custom_prompt):     # Prepare GPT API messages
-    """Create the message structure for the GPT API request."""
+    """Create the message structure for the GPT API request, trimming articles to the token budget."""
     prompt = custom_prompt or DEFAULT_GPT_PROMPT
+    system_message = {"role": "system", "content": "You are a helpful assistant that writes news anchor scripts."}
+    overhead = token_budget.count_message_tokens([system_message, {"content": f"{prompt}\n\n"}], SCRIPT_MODEL)
+    articles = token_budget.fit_articles(
+        list(map(dedup.merge_cluster, articles)), token_budget.get_max_prompt_tokens() - overhead, SCRIPT_MODEL)
     return [
-        {"role": "system", "content": "You are a helpful assistant that writes news anchor scripts."},
+        system_message,
         {"role": "user", "content": f"{prompt}\n\n" +
          "\n".join(f"- {article['title']}: {article['summary']}" for article in articles)}
     ]
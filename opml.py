@@ -0,0 +1,89 @@
+import xml.etree.ElementTree as ET
+import config
+import feed_fetcher
+import utils
+
+def import_opml(path, probe=False):
+    """Import every feed from an OPML file in a single config write.
+
+    Args:
+        path: Path to the OPML file
+        probe: Also drop feeds that do not respond, checked concurrently
+
+    Returns:
+        tuple: (list of added feeds, list of (feed, reason) tuples for skipped feeds)
+
+    Raises:
+        ET.ParseError: If the file is not valid XML
+        OSError: If the file could not be read or the config could not be written
+    """
+    feeds, skipped = [], []
+    for feed in parse_opml(path):
+        if utils.is_valid_url(feed['url']):
+            feeds.append(feed)
+        else:
+            skipped.append((feed, "invalid URL"))
+
+    if probe:
+        failures = feed_fetcher.probe_feeds([feed['url'] for feed in feeds])
+        skipped.extend((feed, failures[feed['url']]) for feed in feeds if feed['url'] in failures)
+        feeds = [feed for feed in feeds if feed['url'] not in failures]
+
+    added, rejected = config.add_feeds(feeds)
+    return added, skipped + rejected
+
+def export_opml(path):
+    """Write every configured feed to an OPML file.
+
+    Args:
+        path: Path to the OPML file
+
+    Returns:
+        int: Number of feeds exported
+    """
+    root = ET.Element('opml', version='2.0')
+    ET.SubElement(ET.SubElement(root, 'head'), 'title').text = f"{utils.APP_NAME} feeds"
+    body = ET.SubElement(root, 'body')
+
+    feeds = config.get_all_feeds()
+    for _, details in feeds:
+        outline = ET.SubElement(body, 'outline', type='rss', text=details['nickname'],
+                                title=details['nickname'], xmlUrl=details['url'])
+        if details.get('tags'):
+            outline.set('category', ','.join(details['tags']))
+
+    tree = ET.ElementTree(root)
+    ET.indent(tree)
+    tree.write(path, encoding='utf-8', xml_declaration=True)
+    return len(feeds)
+
+def parse_opml(path):
+    """Read the feeds listed in an OPML file.
+
+    Folder outlines and 'category' attributes become feed tags.
+
+    Args:
+        path: Path to the OPML file
+
+    Returns:
+        list: Feed dicts with 'url', 'nickname' and optional 'tags'
+    """
+    body = ET.parse(path).getroot().find('body')
+    return list(_walk_outlines(body, [])) if body is not None else []
+
+# Helpers
+def _walk_outlines(parent, folders):
+    """Yield feeds from nested outlines, tracking the enclosing folder names."""
+    for outline in parent.findall('outline'):
+        name = outline.get('title') or outline.get('text') or ''
+        url = outline.get('xmlUrl')
+        if not url:                                 # A folder of feeds
+            yield from _walk_outlines(outline, folders + [name] if name else folders)
+            continue
+
+        categories = [tag.strip().strip('/') for tag in (outline.get('category') or '').split(',')]
+        tags = list(dict.fromkeys(tag for tag in folders + categories if tag))
+        feed = {'url': url.strip(), 'nickname': name or url.strip()}
+        if tags:
+            feed['tags'] = tags
+        yield feed
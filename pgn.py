@@ -1,13 +1,18 @@
-from pygooglenews import GoogleNews
+from urllib.parse import quote, urlencode
+import feedparser
 import bottom_win
 import message_win
 from time import sleep
 from time import strptime
 import pickle
 import re
+import article_store
+import http_client
 from bottom_win import bgetstr
 
-gn = GoogleNews()
+# Google News Constants
+GOOGLE_NEWS_RSS = "https://news.google.com/rss"
+GOOGLE_NEWS_PARAMS = {'hl': 'en-US', 'gl': 'US', 'ceid': 'US:en'}
 
 def search_querytime():
     message_win.clear_buffer()
@@ -18,7 +23,7 @@ def search_querytime():
     message_win.print_msg(f"Query: {query}")
     timespan = bgetstr("Time before: ")
     message_win.print_msg(f"Time: {timespan or "any"}")
-    return _format_entires_to_articles(gn.search(query, when=timespan))
+    return _format_entires_to_articles(_google_news("/search", q=f"{query} when:{timespan}" if timespan else query))
 
 def search_geolocation():
     message_win.clear_buffer()
@@ -31,7 +36,7 @@ def search_geolocation():
     message_win.print_msg(" eg. \"geo_location\": \"1023191\"")
     message_win.print_msg("A list of these values is available at: https://developers.google.com/adwords/api/docs/appendix/geotargeting")
     geolocation = bgetstr("Please enter the geolocation: ")
-    return _format_entires_to_articles(gn.geo_headlines(geolocation))
+    return _format_entires_to_articles(_google_news(f"/headlines/section/geo/{quote(geolocation)}"))
 
 def search_topic():
     message_win.clear_buffer()
@@ -57,7 +62,7 @@ def search_topic():
             sleep(2)
         else:
             break
-    return _format_entires_to_articles(gn.topic_headlines(selected_topic))
+    return _format_entires_to_articles(_google_news(f"/headlines/section/topic/{selected_topic.upper()}"))
 
 def pgn_search():
     """Search for articles using pygooglenews."""
@@ -79,7 +84,7 @@ def pgn_search():
 
     match selection:
         case "1":
-            return _format_entires_to_articles(gn.top_news())
+            return _format_entires_to_articles(_google_news(""))
         
         case "2":
             return search_topic()
@@ -102,18 +107,28 @@ def pgn_search():
 #
 #    return escape_mask.format(parameters, uri, label)
 
+def _google_news(path, **params):
+    """Fetch and parse a Google News RSS feed on the shared connection pool."""
+    response = http_client.get(f"{GOOGLE_NEWS_RSS}{path}?{urlencode({**params, **GOOGLE_NEWS_PARAMS})}")
+    response.raise_for_status()
+    return feedparser.parse(response.content)
+
 def _format_entires_to_articles(results):
     """Format the pygooglenews response to a list of articles."""       
     # Transform each article to match expected format (title, summary, date)
     entries = results['entries']
     formatted_articles = []
     for article in entries:
-        formatted_articles.append({
+        formatted_article = {
             'title': article['title'],
             'summary': re.sub('<[^<]+?>', '', article['summary']),
             'date': strptime(article['published'], "%a, %d %b %Y %H:%M:%S %Z"),
-            'url': article['link']
-        })
+            'url': article['link'],
+            'guid': article.get('id'),
+            'feed': article_store.GOOGLE_NEWS_FEED
+        }
+        formatted_article['id'] = article_store.article_id(formatted_article)
+        formatted_articles.append(formatted_article)
         
     return formatted_articles
 
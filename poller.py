@@ -0,0 +1,91 @@
+import time
+import config
+import feed_fetcher
+import article_store
+
+# Polling Constants
+DEFAULT_INTERVAL = 15 * 60          # First poll interval for a feed, in seconds
+MIN_INTERVAL = 5 * 60               # Fastest a busy feed is polled
+MAX_INTERVAL = 6 * 60 * 60          # Slowest a quiet feed is polled
+SPEEDUP_FACTOR = 0.5                # Interval multiplier when a poll finds new articles
+SLOWDOWN_FACTOR = 1.5               # Interval multiplier when a poll finds nothing new
+ERROR_INTERVAL = 30 * 60            # Retry delay for feeds that failed to fetch
+IDLE_SLEEP = 30                     # Seconds to sleep when no feed is due
+
+def run(tag=None, once=False):
+    """Poll configured feeds forever, storing new articles as they are published.
+
+    Args:
+        tag: Only poll feeds with this tag
+        once: Poll every feed a single time and return
+    """
+    _log(f"Polling feeds{f' tagged {tag}' if tag else ''}. Press CTRL+C to stop.")
+    try:
+        while True:
+            urls = _get_feed_urls(tag)
+            due = urls if once else [url for url in urls if not article_store.is_fresh(url)]
+            if due:
+                poll_feeds(due)
+            if once:
+                return
+            time.sleep(_seconds_until_next_poll(urls))
+    except KeyboardInterrupt:
+        _log("Poller stopped.")
+
+def poll_feeds(urls):
+    """Fetch the given feeds concurrently and store their articles.
+
+    Args:
+        urls: List of feed URLs
+
+    Returns:
+        int: Total number of new articles stored
+    """
+    results, errors = feed_fetcher.fetch_each_feed(urls)
+    total_new = 0
+    for url, articles in results.items():
+        new_count = article_store.ingest(articles, url)
+        interval = record_poll(url, new_count)
+        total_new += new_count
+        _log(f"{url}: {new_count} new, next poll in {int(interval // 60)} min")
+    for url, error in errors.items():
+        article_store.set_feed_state(url, time.time(), ERROR_INTERVAL)
+        _log(f"{url}: failed ({error})")
+    return total_new
+
+def record_poll(url, new_count):
+    """Record a poll and adapt the feed's interval to how often it publishes.
+
+    Busy feeds are polled more often, quiet ones back off up to MAX_INTERVAL.
+
+    Args:
+        url: Feed URL
+        new_count: Number of new articles found by the poll
+
+    Returns:
+        float: Seconds until the feed should be polled again
+    """
+    state = article_store.get_feed_state(url)
+    interval = state['interval'] if state else DEFAULT_INTERVAL
+    interval *= SPEEDUP_FACTOR if new_count else SLOWDOWN_FACTOR
+    interval = max(MIN_INTERVAL, min(MAX_INTERVAL, interval))
+    article_store.set_feed_state(url, time.time(), interval)
+    return interval
+
+# Helpers
+def _get_feed_urls(tag):
+    """Get the URLs of configured feeds, optionally only those with a tag."""
+    return config.select_feed_urls(f"#{tag}" if tag else "*")
+
+def _seconds_until_next_poll(urls):
+    """Get how long to sleep before the next feed is due."""
+    if not urls:
+        return IDLE_SLEEP
+    next_polls = [state['next_poll'] for state in map(article_store.get_feed_state, urls) if state]
+    if len(next_polls) < len(urls):         # A new feed has never been polled
+        return 0
+    return max(1, min(IDLE_SLEEP, min(next_polls) - time.time()))
+
+def _log(message):
+    """Print a timestamped status line."""
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
@@ -0,0 +1,20 @@
+# USD per million tokens as (input, output)
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+DEFAULT_MODEL = "gpt-4o"        # Prices assumed for models missing from the table
+
+def estimate_cost(model, prompt_tokens, completion_tokens=0):
+    """Estimate the dollar cost of a chat completion.
+
+    Args:
+        model: Model name
+        prompt_tokens: Tokens sent
+        completion_tokens: Tokens received
+
+    Returns:
+        float: Cost in US dollars
+    """
+    input_price, output_price = MODEL_PRICES.get(model, MODEL_PRICES[DEFAULT_MODEL])
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
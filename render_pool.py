@@ -0,0 +1,188 @@
+import asyncio
+import atexit
+import threading
+from concurrent.futures import as_completed
+import extractors
+import scrape_cache
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:      # Optional dependency, only needed for headless rendering
+    async_playwright = None
+
+# Rendering Constants
+RENDER_CONCURRENCY = 4                              # Browser contexts kept warm, and pages rendered at once
+RENDER_TIMEOUT = 20                                 # Per-page navigation timeout in seconds
+SETTLE_TIME = 0.5                                   # Seconds to let scripts finish after the page loads
+BLOCKED_RESOURCES = {'image', 'font', 'media'}      # Resource types never downloaded
+INSTALL_HINT = "pip install playwright && playwright install chromium"
+
+_lock = threading.Lock()
+_loop = None            # Event loop running on the pool's background thread
+_pool = None            # asyncio.Queue of idle browser contexts
+_browser = None
+_playwright = None
+
+def is_available():
+    """Check whether the headless browser dependency is installed."""
+    return async_playwright is not None
+
+def render_article(article, timeout=RENDER_TIMEOUT):
+    """Render a single article in the headless browser, never raising.
+
+    Args:
+        article: Article dictionary with a 'url'
+        timeout: Navigation timeout in seconds
+
+    Returns:
+        dict: Article with its full text as the summary, or the original
+              article marked with 'scrape_failed' and 'scrape_error'
+    """
+    return next(iter_rendered_articles([article], timeout=timeout))[1]
+
+def iter_rendered_articles(articles, concurrency=RENDER_CONCURRENCY, timeout=RENDER_TIMEOUT):
+    """Render articles in parallel on a warm pool of browser contexts.
+
+    The browser and its contexts are started once and reused by every later
+    call. Images, fonts and media are blocked to cut page-load time.
+
+    Args:
+        articles: List of article dictionaries
+        concurrency: Number of browser contexts in the pool, used on first start
+        timeout: Per-page navigation timeout in seconds
+
+    Returns:
+        generator: (index, rendered article) tuples in completion order
+
+    Raises:
+        RuntimeError: If playwright is not installed
+    """
+    if not is_available():
+        raise RuntimeError(f"Headless rendering needs playwright: {INSTALL_HINT}")
+    if not articles:
+        return iter(())
+    _start_pool(concurrency)
+    futures = {
+        asyncio.run_coroutine_threadsafe(_render_article(article, timeout), _loop): index
+        for index, article in enumerate(articles)
+    }
+
+    def results():
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    return results()
+
+def close():
+    """Shut down the browser and its background thread."""
+    global _loop, _pool, _browser, _playwright
+    with _lock:
+        if _loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(_stop_browser(), _loop).result()
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop, _pool, _browser, _playwright = None, None, None, None
+
+# Helpers
+def _start_pool(size):
+    """Start the background event loop and warm browser contexts if not already running."""
+    global _loop
+    with _lock:
+        if _loop is not None:
+            return
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="render-pool", daemon=True).start()
+        try:
+            asyncio.run_coroutine_threadsafe(_start_browser(size), loop).result()
+        except Exception:
+            loop.call_soon_threadsafe(loop.stop)
+            raise
+        _loop = loop
+        atexit.register(close)
+
+async def _start_browser(size):
+    """Launch the browser and fill the pool with contexts that block heavy resources."""
+    global _pool, _browser, _playwright
+    _playwright = await async_playwright().start()
+    try:
+        _browser = await _playwright.chromium.launch(headless=True)
+        _pool = asyncio.Queue()
+        for _ in range(max(1, size)):
+            _pool.put_nowait(await _new_context())
+    except BaseException:                           # Stop the driver process rather than leak it
+        await _stop_browser()
+        _pool, _browser, _playwright = None, None, None
+        raise
+
+async def _stop_browser():
+    """Close the browser and stop playwright."""
+    try:
+        if _browser is not None:
+            await _browser.close()
+    finally:
+        await _playwright.stop()
+
+async def _new_context():
+    """Open a browser context that blocks heavy resources."""
+    context = await _browser.new_context(java_script_enabled=True)
+    await context.route("**/*", _block_heavy_resources)
+    return context
+
+async def _close_quietly(context):
+    """Close a context that failed, ignoring errors from an already broken one."""
+    if context is not None:
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+async def _block_heavy_resources(route):
+    """Abort requests for resources that do not affect article text."""
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _render_article(article, timeout):
+    """Render one article on a pooled context and extract its text."""
+    if not article.get('url'):          # Manually entered articles have nothing to render
+        return article
+    try:
+        article_text = await asyncio.to_thread(scrape_cache.get, article['url'])
+        if article_text is None:                    # Cache miss, render and parse
+            html = await _render_html(article['url'], timeout)
+            article_text = await asyncio.to_thread(_extract_and_cache, html, article['url'])
+    except Exception as e:
+        return {**article, 'scrape_failed': True, 'scrape_error': str(e) or type(e).__name__}
+
+    return {**article, 'summary': article_text}     # Keeps 'duplicates', 'feed' and 'guid' for later stages
+
+def _extract_and_cache(html, url):
+    """Extract text from rendered HTML off the event loop and cache it."""
+    article_text, _ = extractors.extract_text(html, url)
+    if not article_text:
+        raise ValueError("no article text found")
+    scrape_cache.put(url, article_text)
+    return article_text
+
+async def _render_html(url, timeout):
+    """Load a page on an idle context and return the rendered HTML.
+
+    A context that raised is closed instead of going back to the pool, and
+    its slot is refilled with a fresh context by the next render.
+    """
+    context = await _pool.get()         # Waits while every context is busy, None marks an empty slot
+    try:
+        context = context or await _new_context()
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until="load", timeout=timeout * 1000)
+            await asyncio.sleep(SETTLE_TIME)
+            return await page.content()
+        finally:
+            await page.close()
+    except BaseException:
+        await _close_quietly(context)
+        context = None
+        raise
+    finally:
+        _pool.put_nowait(context)
@@ -0,0 +1,190 @@
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import httpx
+import config
+
+# Retry Constants
+MAX_ATTEMPTS = 2                    # Tries per request, including the first
+BACKOFF_BASE = 0.5                  # Seconds before the first retry, doubled on each later one
+BACKOFF_MAX = 8                     # Longest wait between tries, also caps Retry-After
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = (httpx.TransportError,)     # Timeouts, refused and reset connections
+
+# Circuit Breaker Constants
+FAILURE_THRESHOLD = 3               # Consecutive failures that open a host's circuit
+BASE_COOLDOWN = 5 * 60              # Seconds a host is skipped after its circuit first opens
+MAX_COOLDOWN = 6 * 60 * 60          # Longest a host is skipped, the cooldown doubles on each reopen
+HEALTH_FILE = 'domain_health.json'  # Persisted host health next to the config file
+HEALTH_TTL = 30 * 24 * 60 * 60      # Forget hosts not contacted for a month
+SAVE_INTERVAL = 5                   # Minimum seconds between health file writes
+LATENCY_WEIGHT = 0.2                # Weight of the newest sample in the latency average
+
+_lock = threading.Lock()
+_health = None          # {host: stats}, loaded on first use
+_probing = set()        # Hosts with a trial request in flight after their cooldown
+_dirty = False
+_last_save = 0
+
+class HostUnavailable(ConnectionError):
+    """Raised without contacting a host whose circuit is open."""
+
+def call(url, send, attempts=MAX_ATTEMPTS):
+    """Send a request with retries, skipping hosts that keep failing.
+
+    Connection errors, timeouts and 429/5xx responses are retried with
+    jittered exponential backoff. Each failure counts against the host; once
+    FAILURE_THRESHOLD are in a row, the host is skipped outright until its
+    cooldown passes, then a single trial request decides whether it recovered.
+
+    Args:
+        url: URL being requested, used to find its host
+        send: Function sending the request and returning an httpx.Response
+        attempts: Tries before giving up
+
+    Returns:
+        httpx.Response: The first non-retryable response, or the last one
+
+    Raises:
+        HostUnavailable: If the host's circuit is open
+        httpx.TransportError: If the last try failed to connect or timed out
+    """
+    host = urlsplit(url).netloc.lower()
+    for attempt in range(attempts):
+        _before_request(host)
+        start = time.monotonic()
+        try:
+            response = send()
+        except RETRYABLE_ERRORS as e:
+            _record_failure(host, str(e) or type(e).__name__)
+            if attempt + 1 >= attempts:
+                raise
+            delay = _backoff(attempt)
+        except Exception:
+            _release_probe(host)        # Not the host's fault, e.g. an oversized body
+            raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS:
+                _record_success(host, time.monotonic() - start)
+                return response
+            _record_failure(host, f"HTTP {response.status_code}")
+            if attempt + 1 >= attempts:
+                return response
+            delay = max(_backoff(attempt), _retry_after(response))
+        time.sleep(delay)
+
+def is_available(url):
+    """Check whether a URL's host would be contacted right now.
+
+    Args:
+        url: URL to check
+
+    Returns:
+        bool: False if the host's circuit is open
+    """
+    host = urlsplit(url).netloc.lower()
+    with _lock:
+        stats = _get_health().get(host)
+        return not stats or stats.get('open_until', 0) <= time.time()
+
+def save():
+    """Write host health to disk if it changed."""
+    global _dirty, _last_save
+    with _lock:
+        if not _dirty:
+            return
+        cutoff = time.time() - HEALTH_TTL
+        health = {host: stats for host, stats in _health.items() if stats.get('updated', 0) >= cutoff}
+        _dirty, _last_save = False, time.time()
+    path = config.get_data_path(HEALTH_FILE)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(health, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass                            # Health is advisory, losing an update is harmless
+
+# Helpers
+def _get_health():
+    """Get host health, loading it from disk on first use. Call with _lock held."""
+    global _health
+    if _health is None:
+        try:
+            with open(config.get_data_path(HEALTH_FILE), 'r', encoding='utf-8') as f:
+                _health = json.load(f)
+        except (OSError, ValueError):
+            _health = {}
+        atexit.register(save)
+    return _health
+
+def _before_request(host):
+    """Raise if the host's circuit is open, letting one trial through once its cooldown passes."""
+    with _lock:
+        stats = _get_health().get(host)
+        if not stats or stats.get('failures', 0) < FAILURE_THRESHOLD:
+            return
+        if stats.get('open_until', 0) > time.time() or host in _probing:
+            retry_at = time.strftime('%H:%M', time.localtime(stats.get('open_until', 0)))
+            raise HostUnavailable(f"{host} is failing ({stats.get('last_error')}), skipped until {retry_at}")
+        _probing.add(host)
+
+def _record_success(host, latency):
+    """Close the host's circuit and update its latency average."""
+    with _lock:
+        stats = _get_health().setdefault(host, {})
+        previous = stats.get('latency')
+        stats.update(
+            failures=0, trips=0, open_until=0, updated=time.time(),
+            successes=stats.get('successes', 0) + 1,
+            latency=latency if previous is None else previous + LATENCY_WEIGHT * (latency - previous),
+        )
+        _probing.discard(host)
+    _mark_dirty()
+
+def _record_failure(host, error):
+    """Count a failure against the host, opening its circuit past the threshold."""
+    with _lock:
+        stats = _get_health().setdefault(host, {})
+        now = time.time()
+        stats.update(
+            failures=stats.get('failures', 0) + 1, updated=now, last_error=error,
+            total_failures=stats.get('total_failures', 0) + 1,
+        )
+        if stats['failures'] >= FAILURE_THRESHOLD:
+            stats['trips'] = stats.get('trips', 0) + 1
+            stats['open_until'] = now + min(BASE_COOLDOWN * 2 ** (stats['trips'] - 1), MAX_COOLDOWN)
+        _probing.discard(host)
+    _mark_dirty()
+
+def _release_probe(host):
+    """Let another request try the host after a trial ended without a verdict."""
+    with _lock:
+        _probing.discard(host)
+
+def _mark_dirty():
+    """Flag host health as changed and save it if the last save is old enough."""
+    global _dirty
+    with _lock:
+        _dirty = True
+        due = time.time() - _last_save >= SAVE_INTERVAL
+    if due:
+        save()
+
+def _backoff(attempt):
+    """Get a full-jitter exponential backoff delay for a retry."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+def _retry_after(response):
+    """Get the delay a 429/503 response asks for, capped at BACKOFF_MAX."""
+    value = response.headers.get('Retry-After', '')
+    try:
+        delay = float(value) if value.strip().isdigit() else parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return 0
+    return min(max(delay, 0), BACKOFF_MAX)
@@ -1,13 +1,22 @@
 import curses
+import os
 import time
+import xml.etree.ElementTree as ET
 import bottom_win
 import message_win
 import config
 from screen_manager import setup_windows
 import utils
 import api_keyring
+import opml
 from pgn import pgn_search
 
+# Feed Group Constants
+ALL_FEEDS = "*"             # Input to fetch every configured feed
+TAG_PREFIX = "#"            # Input prefix to fetch feeds with a given tag
+IMPORT_COMMAND = ":import"  # Input prefix to import feeds from an OPML file
+EXPORT_COMMAND = ":export"  # Input prefix to export feeds to an OPML file
+
 # Display Functions
 def display_feeds(feeds, start_idx):  # Main function to show RSS feeds
     """Display a paginated list of RSS feeds in the window."""
@@ -16,28 +25,28 @@ def display_feeds(feeds, start_idx):  # Main function to show RSS feeds
     max_width = width - 2       # Account for side margins
 
     message_win.erase()
-    message_win.print(f"Available RSS Feeds: [CTRL+C to quit, CTRL+N manual input, {"CTRL+O" if utils.IS_WINDOWS else "CTRL+W"} google news, CTRL+R to reset credentials]")
+    message_win.print(f"Available RSS Feeds: [CTRL+C to quit, CTRL+N manual input, {"CTRL+O" if utils.IS_WINDOWS else "CTRL+W"} google news, CTRL+B stored articles, CTRL+R to reset credentials]")
     _display_feed_list(feeds, start_idx, max_lines, max_width)
 
 def _display_feed_list(feeds, start_idx, max_lines, max_width):  # Helper for feed display
     line_number = 1
-    for idx in range(start_idx, min(start_idx + max_lines - 1, len(feeds.items()))):
-        key, details = list(feeds.items())[idx]    # Extract feed details
+    for key, details in config.get_feed_page(start_idx, max_lines - 1):    # Only the visible page
         nickname = details['nickname']
         url = details['url']
+        tags = "".join(f" {TAG_PREFIX}{tag}" for tag in details.get('tags', []))
         
         if len(nickname) > max_width:              # Handle long nicknames
             nickname = nickname[:max_width - 3] + "..."
 
         try:
-            message_win.print(f"{key}: {nickname} ({url})")
+            message_win.print(f"{key}: {nickname} ({url}){tags}")
             line_number += 1
         except curses.error:
             pass
 
 # Input Handling Functions
 def get_rss_urls(feeds):        # Main input handler for RSS URLs
-    prompt = "Select a feed number or enter URL(s): "
+    prompt = "Select a feed number, '*' for all, '#tag' for tagged feeds or enter URL(s): "
     feed_scroll_idx = 0
     
     def display_callback():     # Updates feed display
@@ -62,6 +71,9 @@ def get_rss_urls(feeds):        # Main input handler for RSS URLs
     
     def pgn_callback():
         return utils.PGN_HOTKEY
+
+    def history_callback():
+        return utils.HISTORY_HOTKEY
     
     
     hotkeys = {                 # Define keyboard shortcuts
@@ -70,12 +82,13 @@ def get_rss_urls(feeds):        # Main input handler for RSS URLs
         curses.KEY_UP: (lambda: handle_scroll(curses.KEY_UP), "scroll up"),
         curses.KEY_RESIZE: (resize_callback, "resize"),
         utils.PGN_HOTKEY: (pgn_callback, "pgn"),
+        utils.HISTORY_HOTKEY: (history_callback, "history"),
         utils.RESET_HOTKEY: (api_keyring.reset_credentials, "reset")
     }
     
     while True:
         selected_option = bottom_win.handle_input(prompt, callback=display_callback, hotkeys=hotkeys)
-        if selected_option in [utils.SKIP_HOTKEY, utils.PGN_HOTKEY]:
+        if selected_option in [utils.SKIP_HOTKEY, utils.PGN_HOTKEY, utils.HISTORY_HOTKEY]:
             return selected_option
         
         if selected_option is None:      # Handle skip action
@@ -91,7 +104,13 @@ def get_rss_urls(feeds):        # Main input handler for RSS URLs
 def _handle_feed_input(selected_option, feeds):    # Process user input for feeds
     if selected_option.isdigit():                  # Handle numeric selection
         return (_handle_feed_number(selected_option, feeds), feeds)
+
+    if selected_option == ALL_FEEDS or selected_option.startswith(TAG_PREFIX):    # Handle feed groups
+        return (_handle_feed_group(selected_option), feeds)
     
+    if selected_option.startswith((IMPORT_COMMAND, EXPORT_COMMAND)):    # Handle OPML import/export
+        return (None, _handle_opml_command(selected_option, feeds))
+
     if ',' in selected_option:                     # Handle multiple URLs
         return (None, _add_multiple_feeds(selected_option.split(','), feeds))
     
@@ -109,6 +128,14 @@ def _handle_feed_number(selected_option, feeds):    # Process numeric feed selec
     time.sleep(2)
     return None
 
+def _handle_feed_group(selected_option):            # Process '*' or '#tag' selection
+    urls = config.select_feed_urls(selected_option)    # Same matching as batch job selectors
+    if urls:
+        return urls
+    bottom_win.print(f"No feeds found for: {selected_option}")
+    time.sleep(2)
+    return None
+
 # Feed Management Functions
 def _add_single_feed(url, feeds):    # Add one feed to config
     url = url.strip()
@@ -127,17 +154,49 @@ def _validate_feed_url(url, feeds):   # Validate feed URL format and uniqueness
         time.sleep(2)
         return False
 
-    if any(feed['url'] == url for feed in feeds.values()):
+    if config.has_feed_url(url):
         bottom_win.print(f"Feed URL '{url}' already exists. Skipping...")
         time.sleep(2)
         return False
     
     return True
 
-def _add_multiple_feeds(urls, feeds):  # Process multiple feed URLs
-    for url in urls:
-        feeds = _add_single_feed(url.strip(), feeds)
-    return feeds
+def _add_multiple_feeds(urls, feeds):  # Process multiple feed URLs in one config write
+    new_feeds, invalid = [], []
+    for url in dict.fromkeys(url.strip() for url in urls):
+        if utils.is_valid_url(url) and not config.has_feed_url(url):
+            new_feeds.append({"url": url, "nickname": _get_feed_nickname(url, feeds)})
+        else:
+            invalid.append(url)
+
+    try:
+        added, skipped = config.add_feeds(new_feeds)
+    except OSError as e:
+        message_win.error(f"Unable to save feeds: {e}.")
+        return config.load_config()
+    bottom_win.print(f"Added {len(added)} feeds, skipped {len(invalid) + len(skipped)} invalid or duplicate URLs.")
+    time.sleep(2)
+    return config.load_config()
+
+def _handle_opml_command(selected_option, feeds):    # Process ':import <file>' or ':export <file>'
+    command, _, path = selected_option.partition(' ')
+    path = os.path.expanduser(path.strip())
+    if not path:
+        bottom_win.print(f"Usage: {IMPORT_COMMAND} <file.opml> or {EXPORT_COMMAND} <file.opml>")
+        time.sleep(2)
+        return feeds
+
+    try:
+        if command == EXPORT_COMMAND:
+            bottom_win.print(f"Exported {opml.export_opml(path)} feeds to {path}.")
+        else:
+            bottom_win.print(f"Importing feeds from {path}...")
+            added, skipped = opml.import_opml(path)
+            bottom_win.print(f"Imported {len(added)} feeds, skipped {len(skipped)}.")
+    except (OSError, ET.ParseError) as e:
+        bottom_win.print(f"OPML {command[1:]} failed: {e}")
+    time.sleep(2)
+    return config.load_config()
 
 def _get_feed_nickname(url, feeds):    # Get user-defined nickname for feed
     def display_callback():            # Update feed display during input
@@ -1,21 +1,142 @@
-import newspaper
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import http_client
 import bottom_win
 import message_win
+import scrape_cache
+import extractors
+import render_pool
 
-def scrape_article_content(articles):
+# Scraping Constants
+SCRAPE_WORKERS = 8          # Maximum number of articles scraped at once
+SCRAPE_TIMEOUT = 15         # Per-article download timeout in seconds
+
+def scrape_article_content(articles, headless=False, prepare=None):
+    """Scrape the full text of articles concurrently, showing progress as each one lands.
+
+    Articles that fail to scrape keep their original summary and are marked
+    with 'scrape_failed' instead of ending the session.
+
+    Args:
+        articles: List of article dictionaries
+        headless: Render pages in a headless browser instead of downloading them
+        prepare: Optional function applied to each article as soon as it is scraped
+
+    Returns:
+        list: Scraped articles in the same order as the input
+    """
+    return collect_scraped_articles(start_scrape(articles, headless, prepare), len(articles))
+
+def start_scrape(articles, headless=False, prepare=None):
+    """Start scraping articles in the background and return right away.
+
+    Each article is passed through prepare on the background thread as soon as
+    it lands, so per-article work overlaps the scrapes still in flight.
+
+    Args:
+        articles: List of article dictionaries
+        headless: Render pages in a headless browser instead of downloading them
+        prepare: Optional function applied to each article as soon as it is scraped
+
+    Returns:
+        queue.Queue: (index, article) tuples in completion order, then None once every article is in
+
+    Raises:
+        RuntimeError: If headless rendering is requested but unavailable
+    """
+    results = queue.Queue()
+    source = render_pool.iter_rendered_articles(articles) if headless else iter_scraped_articles(articles)
+
+    def consume():
+        try:
+            for index, article in source:
+                if prepare is not None:
+                    try:
+                        article = prepare(article)
+                    except Exception as e:      # Keep the unprepared article rather than losing it
+                        article = {**article, 'prepare_error': str(e)}
+                results.put((index, article))
+        finally:
+            results.put(None)
+    threading.Thread(target=consume, name="scrape-stream", daemon=True).start()
+    return results
+
+def collect_scraped_articles(results, count):
+    """Wait for the rest of a background scrape, showing progress as each article lands.
+
+    Args:
+        results: Queue returned by start_scrape
+        count: Number of articles being scraped
+
+    Returns:
+        list: Scraped articles in the same order as the input
+    """
     message_win.clear_buffer()
-    transformed_articles = []
-    for article in articles:
-        message_win.print_msg(f"Scraping article {article["url"]}...")
-        news_article = newspaper.Article(article['url'])
-        news_article.download()
-        news_article.parse()
-        article_text = news_article.text
-        new_article = {
-            'date': article['date'],
-            'title': article['title'],
-            'summary': article_text,
-            'url': article['url']
-        }
-        transformed_articles.append(new_article)
-    return transformed_articles
\ No newline at end of file
+    message_win.print_msg(f"Scraping {count} articles...")
+    transformed_articles = [None] * count
+    done = 0
+    while (item := results.get()) is not None:
+        index, article = item
+        transformed_articles[index] = article
+        done += 1
+        status = f"failed ({article['scrape_error']})" if article.get('scrape_failed') else "done"
+        message_win.print_msg(f"[{done}/{count}] {article['url']}: {status}")
+    return transformed_articles
+
+def iter_scraped_articles(articles, workers=SCRAPE_WORKERS, timeout=SCRAPE_TIMEOUT):
+    """Scrape articles on a bounded worker pool, yielding each one as soon as it finishes.
+
+    Downloads start immediately, before the generator is first advanced.
+
+    Args:
+        articles: List of article dictionaries
+        workers: Maximum number of concurrent scrapes
+        timeout: Per-article download timeout in seconds
+
+    Returns:
+        generator: (index, scraped article) tuples in completion order
+    """
+    if not articles:
+        return iter(())
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(articles))))
+    futures = {executor.submit(scrape_article, article, timeout): index for index, article in enumerate(articles)}
+    executor.shutdown(wait=False)       # Workers exit once the queued scrapes finish
+
+    def results():
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    return results()
+
+def scrape_article(article, timeout=SCRAPE_TIMEOUT):
+    """Download and parse a single article, never raising.
+
+    Args:
+        article: Article dictionary with a 'url'
+        timeout: Download timeout in seconds
+
+    Returns:
+        dict: Article with its full text as the summary, or the original
+              article marked with 'scrape_failed' and 'scrape_error'
+    """
+    if not article.get('url'):          # Manually entered articles have nothing to scrape
+        return article
+    try:
+        article_text = scrape_cache.get(article['url'])
+        if article_text is None:                    # Cache miss, download and parse
+            article_text = _download_and_parse(article['url'], timeout)
+            if not article_text:
+                raise ValueError("no article text found")
+            scrape_cache.put(article['url'], article_text)
+    except Exception as e:
+        return {**article, 'scrape_failed': True, 'scrape_error': str(e) or type(e).__name__}
+
+    return {**article, 'summary': article_text}     # Keeps 'duplicates', 'feed' and 'guid' for later stages
+
+# Helpers
+def _download_and_parse(url, timeout):
+    """Download a page and extract its text, trying the fast extractor first."""
+    response = http_client.get(url, timeout=timeout)
+    response.raise_for_status()
+    article_text, _ = extractors.extract_text(response.text, url)
+    return article_text
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import article_store
+import config
+
+# Cache Constants
+CACHE_FILE = 'scrape_cache.db'                  # SQLite database next to the config file
+CACHE_PATH_ENV = 'EDNASG_SCRAPE_CACHE'          # Overrides the location, which must be on a local disk
+CACHE_TTL = 7 * 24 * 60 * 60                    # Scraped text is reused for a week
+CACHE_MAX_BYTES = 200 * 1024 * 1024             # Total size cap for compressed text
+EVICTION_INTERVAL = 100                         # Check the size cap every this many writes
+
+_local = threading.local()
+_write_count = 0
+_write_count_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url_key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed);
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+def get(url):
+    """Get the cached text of an article.
+
+    Args:
+        url: Article URL
+
+    Returns:
+        str: Cached article text, or None on a miss or expired entry
+    """
+    url_key = _url_key(url)
+    conn = _get_connection()
+    row = conn.execute("""
+        SELECT blobs.data, pages.created FROM pages JOIN blobs USING (content_hash)
+        WHERE pages.url_key = ?
+    """, (url_key,)).fetchone()
+    if row is None or time.time() - row[1] > CACHE_TTL:
+        return None
+
+    with conn:
+        conn.execute("UPDATE pages SET accessed = ? WHERE url_key = ?", (time.time(), url_key))
+    return zlib.decompress(row[0]).decode('utf-8')
+
+def put(url, text):
+    """Cache the text of an article, sharing storage with identical text from other URLs.
+
+    Args:
+        url: Article URL
+        text: Extracted article text
+    """
+    global _write_count
+    data = zlib.compress(text.encode('utf-8'), 6)
+    content_hash = hashlib.sha256(data).hexdigest()
+    now = time.time()
+    with _get_connection() as conn:
+        conn.execute("INSERT OR IGNORE INTO blobs (content_hash, data, size) VALUES (?, ?, ?)",
+                     (content_hash, data, len(data)))
+        conn.execute("""
+            INSERT INTO pages (url_key, content_hash, created, accessed) VALUES (?, ?, ?, ?)
+            ON CONFLICT(url_key) DO UPDATE SET
+                content_hash = excluded.content_hash, created = excluded.created, accessed = excluded.accessed
+        """, (_url_key(url), content_hash, now, now))
+
+    with _write_count_lock:
+        _write_count += 1
+        due = _write_count % EVICTION_INTERVAL == 1
+    if due:
+        evict()
+
+def evict():
+    """Remove expired pages, then the least recently used ones until under the size cap."""
+    with _get_connection() as conn:
+        conn.execute("DELETE FROM pages WHERE created < ?", (time.time() - CACHE_TTL,))
+        _delete_orphan_blobs(conn)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= CACHE_MAX_BYTES:
+            return
+
+        rows = conn.execute("""
+            SELECT pages.url_key, blobs.size FROM pages JOIN blobs USING (content_hash) ORDER BY pages.accessed
+        """).fetchall()
+        stale_keys = []
+        for url_key, size in rows:                  # Oldest access first
+            if total <= CACHE_MAX_BYTES:
+                break
+            stale_keys.append((url_key,))
+            total -= size
+        conn.executemany("DELETE FROM pages WHERE url_key = ?", stale_keys)
+        _delete_orphan_blobs(conn)
+
+# Helpers
+def _get_connection():
+    """Get this thread's connection to the cache, creating the schema on first use."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        path = os.environ.get(CACHE_PATH_ENV) or config.get_data_path(CACHE_FILE)
+        conn = sqlite3.connect(path, timeout=30)    # Wait on other processes' write locks
+        conn.execute("PRAGMA journal_mode=WAL")     # Needs shared memory, so never a network filesystem
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+def _url_key(url):
+    """Hash the canonical form of a URL."""
+    return hashlib.sha256(article_store.canonical_url(url).encode('utf-8')).hexdigest()
+
+def _delete_orphan_blobs(conn):
+    """Delete stored text no longer referenced by any page."""
+    conn.execute("DELETE FROM blobs WHERE content_hash NOT IN (SELECT content_hash FROM pages)")
@@ -0,0 +1,160 @@
+import math
+import re
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+
+# Search Constants
+TITLE_WEIGHT = 3.0          # A title match counts this many times a summary match
+FUZZY_MIN_LENGTH = 4        # Shorter terms are only matched exactly or by prefix
+FUZZY_PENALTY = 0.5         # Score multiplier for fuzzy matches
+PREFIX_PENALTY = 0.8        # Score multiplier for prefix matches
+PREFIX_MIN_LENGTH = 2       # Shorter partial terms are only matched exactly
+QUERY_CACHE_SIZE = 256      # Number of recent queries kept per index
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TAG_PATTERN = re.compile(r"<[^<]+?>")
+
+def build_index(articles):
+    """Build an inverted index over article titles and summaries.
+
+    Args:
+        articles: List of article dictionaries
+
+    Returns:
+        dict: Index to pass to search()
+    """
+    postings = {}
+    for doc, article in enumerate(articles):
+        weights = {}
+        for token in tokenize(article.get('title', '')):
+            weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(TAG_PATTERN.sub(' ', article.get('summary') or '')):
+            weights[token] = weights.get(token, 0) + 1
+        for token, weight in weights.items():
+            postings.setdefault(token, {})[doc] = 1 + math.log(weight)    # Dampen repeated terms
+
+    doc_count = max(1, len(articles))
+    return {
+        'postings': postings,
+        'idf': {term: math.log(1 + doc_count / len(docs)) for term, docs in postings.items()},
+        'vocab': sorted(postings),
+        'size': len(articles),
+        'deletions': None,          # Built by build_deletions, or on the first fuzzy lookup
+        'cache': {}
+    }
+
+def start_index(articles):
+    """Build an index and its fuzzy lookup table on a background thread.
+
+    Started when a list opens, the index is usually ready before the first
+    keystroke, so no keystroke pays for building it.
+
+    Args:
+        articles: List of article dictionaries
+
+    Returns:
+        concurrent.futures.Future: Resolves to the index
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(lambda: build_deletions(build_index(articles)))
+    executor.shutdown(wait=False)
+    return future
+
+def build_deletions(index):
+    """Build the single-character deletion table fuzzy matching uses.
+
+    Args:
+        index: Index returned by build_index()
+
+    Returns:
+        dict: The same index, ready for fuzzy lookups
+    """
+    if index['deletions'] is None:
+        deletions = {}
+        for indexed_term in index['postings']:
+            if len(indexed_term) >= FUZZY_MIN_LENGTH:
+                for variant in _deletion_variants(indexed_term):
+                    deletions.setdefault(variant, []).append(indexed_term)
+        index['deletions'] = deletions
+    return index
+
+def search(index, query):
+    """Find articles matching every term of a query, best matches first.
+
+    The last term is treated as a prefix since it may still be being typed,
+    and ignored until it is PREFIX_MIN_LENGTH long, so the first character
+    typed does not empty the list. Terms with no exact match fall back to
+    one-edit fuzzy matches.
+
+    Args:
+        index: Index returned by build_index()
+        query: Search text
+
+    Returns:
+        list: Indices of matching articles in ranked order
+    """
+    terms = tokenize(query)
+    if terms and not query.endswith(' ') and len(terms[-1]) < PREFIX_MIN_LENGTH:
+        terms.pop()                                 # Too short to match usefully yet
+    if not terms:
+        return list(range(index['size']))
+    key = (tuple(terms), query.endswith(' '))
+    cache = index['cache']
+    if key in cache:
+        return cache[key]
+
+    scores = None
+    for position, term in enumerate(terms):
+        is_last = position == len(terms) - 1 and not query.endswith(' ')
+        term_scores = _score_term(index, term, prefix=is_last)
+        if scores is None:
+            scores = term_scores
+        else:                                       # Every term must match
+            scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+        if not scores:
+            break
+
+    results = sorted(scores, key=lambda doc: (-scores[doc], doc)) if scores else []
+    if len(cache) >= QUERY_CACHE_SIZE:
+        cache.pop(next(iter(cache)))                # Drop the oldest query
+    cache[key] = results
+    return results
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+# Helpers
+def _score_term(index, term, prefix=False):
+    """Score every article containing a term, its prefix extensions or fuzzy variants."""
+    postings, idf = index['postings'], index['idf']
+    matches = {term: 1.0} if term in postings else {}
+    if prefix and len(term) >= PREFIX_MIN_LENGTH:
+        vocab = index['vocab']
+        for i in range(bisect_left(vocab, term), len(vocab)):
+            if not vocab[i].startswith(term):
+                break
+            matches.setdefault(vocab[i], PREFIX_PENALTY)
+    if not matches and len(term) >= FUZZY_MIN_LENGTH:
+        matches = {candidate: FUZZY_PENALTY for candidate in _fuzzy_candidates(index, term)}
+
+    scores = {}
+    for match, penalty in matches.items():
+        weight = idf[match] * penalty
+        for doc, tf in postings[match].items():
+            scores[doc] = max(scores.get(doc, 0), tf * weight)
+    return scores
+
+def _fuzzy_candidates(index, term):
+    """Find indexed terms about one edit away from a term, using shared single-character deletions."""
+    deletions = build_deletions(index)['deletions']
+    candidates = set(deletions.get(term, ()))                   # Term is missing a character
+    for variant in _deletion_variants(term):
+        if variant in index['postings']:                        # Term has an extra character
+            candidates.add(variant)
+        candidates.update(deletions.get(variant, ()))           # Substitutions and transpositions
+    return {candidate for candidate in candidates if abs(len(candidate) - len(term)) <= 1}
+
+def _deletion_variants(term):
+    """Get every string formed by deleting one character from a term."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
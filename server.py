@@ -0,0 +1,238 @@
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from jsonschema import ValidationError
+import batch
+import config
+
+# Server Constants
+SERVER_HOST = "127.0.0.1"           # Local only, the API has no authentication
+SERVER_PORT = 8765
+SERVER_WORKERS = 4                  # Jobs run at once
+QUEUE_SIZE = 32                     # Waiting jobs beyond this are refused with 503
+JOB_HISTORY = 200                   # Finished jobs kept for polling
+MAX_REQUEST_BYTES = 1024 * 1024
+HEARTBEAT_INTERVAL = 15             # Seconds between keep-alive comments on an idle event stream
+RETRY_AFTER = 5                     # Seconds a refused client is told to wait
+OUTPUT_DIR = 'server_output'        # Scripts and images jobs save, next to the config file
+
+class JobServer(ThreadingHTTPServer):
+    """HTTP server that queues script jobs and runs them on a pool of workers.
+
+    Every worker shares one OpenAI client and the process-wide HTTP pool, so
+    connections stay warm between jobs. Jobs only write files inside
+    output_dir.
+    """
+    daemon_threads = True
+
+    def __init__(self, client, address, workers=SERVER_WORKERS, queue_size=QUEUE_SIZE, output_dir=None):
+        super().__init__(address, _Handler)
+        self.client = client
+        self.output_dir = output_dir or config.get_data_path(OUTPUT_DIR)
+        self.jobs = OrderedDict()               # {id: job record}, oldest first
+        self.pending = queue.Queue(maxsize=queue_size)
+        self.changed = threading.Condition()    # Guards self.jobs, notified on every event
+        self.workers = workers
+        for _ in range(workers):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def submit(self, job):
+        """Queue a validated job.
+
+        Args:
+            job: Job from batch.validate_job
+
+        Returns:
+            dict: The new job record
+
+        Raises:
+            queue.Full: If the queue is at capacity
+        """
+        record = {'id': uuid.uuid4().hex[:12], 'name': job['name'], 'status': "queued", 'stage': None,
+                  'created': time.time(), 'started': None, 'finished': None,
+                  'events': [("status", "queued")], 'result': None}
+        with self.changed:
+            self.jobs[record['id']] = record        # Before queueing, so a worker always finds it
+            try:
+                self.pending.put_nowait((record['id'], job))
+            except queue.Full:
+                del self.jobs[record['id']]
+                raise
+            self._forget_old_jobs()
+        return record
+
+    def publish(self, job_id, event, data):
+        """Record an event for a job and wake any stream following it."""
+        with self.changed:
+            record = self.jobs.get(job_id)
+            if record is None:
+                return
+            if event == "stage":
+                record['stage'] = data
+            elif event == "status":
+                record['status'] = data
+            elif event == "result":
+                record.update(status=data['status'], result=data, finished=time.time())
+            record['events'].append((event, data))
+            self.changed.notify_all()
+
+    def _work(self):
+        """Worker loop, runs queued jobs one at a time."""
+        while True:
+            job_id, job = self.pending.get()
+            with self.changed:
+                if job_id in self.jobs:
+                    self.jobs[job_id]['started'] = time.time()
+            self.publish(job_id, "status", "running")
+            result = batch.run_job(self.client, job, on_event=lambda event, data: self.publish(job_id, event, data),
+                                   output_dir=self.output_dir)
+            self.publish(job_id, "result", result)
+            self.pending.task_done()
+
+    def _forget_old_jobs(self):
+        """Drop the oldest finished jobs beyond JOB_HISTORY, called with the lock held."""
+        finished = [job_id for job_id, record in self.jobs.items() if record['finished']]
+        for job_id in finished[:max(0, len(self.jobs) - JOB_HISTORY)]:
+            del self.jobs[job_id]
+
+def serve(client, host=SERVER_HOST, port=SERVER_PORT, workers=SERVER_WORKERS, queue_size=QUEUE_SIZE,
+          output_dir=None):
+    """Serve the job API until interrupted.
+
+    Args:
+        client: OpenAI client instance shared by every job
+        host: Address to bind
+        port: Port to bind, 0 picks a free one
+        workers: Jobs run at once
+        queue_size: Jobs allowed to wait for a worker
+        output_dir: Directory job output paths are confined to, OUTPUT_DIR by default
+    """
+    server = JobServer(client, (host, port), workers, queue_size, output_dir)
+    print(f"Serving script jobs on http://{host}:{server.server_address[1]}, saving to {server.output_dir}. "
+          "Press CTRL+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Server stopped.")
+    finally:
+        server.server_close()
+
+# Helpers
+class _Handler(BaseHTTPRequestHandler):
+    """Routes the job API:
+
+    POST /jobs              Queue a job, the body is a job as in batch job files, sent as application/json
+    GET  /jobs              Summaries of known jobs
+    GET  /jobs/<id>         A job's status, its script so far and, once done, its result
+    GET  /jobs/<id>/events  Server-sent events: status, stage, chunk and a final result
+    GET  /health            Queue and worker counts
+    """
+
+    def do_POST(self):
+        if self.path.rstrip('/') != "/jobs":
+            return self._send_json(404, {'error': "not found"})
+        if self.headers.get_content_type() != "application/json":     # Also stops cross-site form posts
+            return self._send_json(415, {'error': "Content-Type must be application/json"})
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:                              # rfile.read(-1) would wait for the client to hang up
+            return self._send_json(400, {'error': "invalid Content-Length"})
+        if length > MAX_REQUEST_BYTES:
+            return self._send_json(413, {'error': "request too large"})
+        try:
+            job = batch.validate_job(json.loads(self.rfile.read(length) or b"null"))
+        except json.JSONDecodeError as e:
+            return self._send_json(400, {'error': f"invalid JSON: {e}"})
+        except ValidationError as e:
+            return self._send_json(400, {'error': f"invalid job: {e.message}"})
+        try:
+            batch.check_output_paths(job, self.server.output_dir)
+        except ValueError as e:
+            return self._send_json(400, {'error': f"invalid job: {e}"})
+        try:
+            record = self.server.submit(job)
+        except queue.Full:
+            return self._send_json(503, {'error': "job queue is full"}, {'Retry-After': str(RETRY_AFTER)})
+        self._send_json(202, _summarize(record), {'Location': f"/jobs/{record['id']}"})
+
+    def do_GET(self):
+        parts = self.path.split('?', 1)[0].strip('/').split('/')
+        match parts:
+            case ["health"]:
+                self._send_json(200, {'queued': self.server.pending.qsize(), 'workers': self.server.workers,
+                                      'running': sum(record['status'] == "running" for record in self._records())})
+            case ["jobs"]:
+                self._send_json(200, [_summarize(record) for record in self._records()])
+            case ["jobs", job_id]:
+                with self.server.changed:
+                    record = self.server.jobs.get(job_id)
+                    summary = _summarize(record, detail=True) if record else None
+                if summary is None:
+                    return self._send_json(404, {'error': "unknown job"})
+                self._send_json(200, summary)
+            case ["jobs", job_id, "events"]:
+                self._stream_events(job_id)
+            case _:
+                self._send_json(404, {'error': "not found"})
+
+    def log_message(self, format, *args):
+        pass
+
+    def _records(self):
+        """Snapshot the job records."""
+        with self.server.changed:
+            return list(self.server.jobs.values())
+
+    def _send_json(self, status, body, headers=None):
+        """Send a JSON response."""
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', "application/json")
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_events(self, job_id):
+        """Replay a job's events as server-sent events, then follow it until its result."""
+        with self.server.changed:
+            record = self.server.jobs.get(job_id)
+        if record is None:
+            return self._send_json(404, {'error': "unknown job"})
+        self.send_response(200)
+        self.send_header('Content-Type', "text/event-stream")
+        self.send_header('Cache-Control', "no-cache")
+        self.end_headers()
+
+        sent = 0
+        try:
+            while True:
+                with self.server.changed:
+                    self.server.changed.wait_for(lambda: len(record['events']) > sent, timeout=HEARTBEAT_INTERVAL)
+                    events = record['events'][sent:]
+                if not events:
+                    self.wfile.write(b": keep-alive\n\n")
+                for event, data in events:
+                    self.wfile.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                sent += len(events)
+                if any(event == "result" for event, _ in events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):     # Client went away
+            return
+
+def _summarize(record, detail=False):
+    """Describe a job record for a response, with its script so far and result if detail is set."""
+    summary = {key: record[key] for key in ('id', 'name', 'status', 'stage', 'created', 'started', 'finished')}
+    if detail:
+        summary['script'] = (record['result'] or {}).get('script') or \
+            "".join(data for event, data in record['events'] if event == "chunk")
+        summary['result'] = record['result']
+    return summary
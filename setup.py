@@ -13,11 +13,11 @@ setup(
         "keyring",
         "jsonschema",
         "windows-curses",
-        "pygooglenews",
+        "httpx",
     ],
     entry_points={
         'console_scripts': [
-            'ednasg=ednasg:main',
+            'ednasg=ednasg:cli',
         ],
     },
     classifiers=[
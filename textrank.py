@@ -0,0 +1,96 @@
+import re
+import numpy as np
+import search_index
+
+# TextRank Constants
+KEY_SENTENCES = 5           # Sentences kept per article
+DAMPING = 0.85              # PageRank damping factor
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6            # Stop once no score moves more than this
+MIN_SENTENCE_LENGTH = 20    # Shorter fragments are captions and bylines, not sentences
+
+SENTENCE_PATTERN = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+(?=[\"'(\[]?[A-Z0-9])|\n{2,}")
+ABBREVIATION_PATTERN = re.compile(r"\b(?:Mr|Mrs|Ms|Dr|Prof|Sen|Rep|Gov|Gen|Lt|Col|St|Jr|Sr|No|vs|Inc|Corp|Co|Ltd|[A-Z])\.$")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have he her his in is it its of on or she that the their "
+    "they this to was were which who will with would said says".split()
+)
+
+def summarize(text, sentences=KEY_SENTENCES):
+    """Shrink text to its most central sentences, kept in their original order.
+
+    Args:
+        text: Article text
+        sentences: Number of sentences to keep
+
+    Returns:
+        str: The key sentences joined by spaces, or the text unchanged if it is already short
+    """
+    candidates = split_sentences(text)
+    if len(candidates) <= sentences:
+        return text
+    scores = rank_sentences(candidates)
+    keep = np.sort(np.argsort(-scores, kind='stable')[:sentences])
+    return " ".join(candidates[i] for i in keep)
+
+def split_sentences(text):
+    """Split text into sentences, dropping fragments too short to be one.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        list: Sentences in order
+    """
+    sentences = []
+    for piece in SENTENCE_PATTERN.split(text):
+        piece = piece.strip()
+        if sentences and ABBREVIATION_PATTERN.search(sentences[-1]):   # "Dr. Smith" is not a sentence break
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        elif piece:
+            sentences.append(piece)
+    return [sentence for sentence in sentences if len(sentence) >= MIN_SENTENCE_LENGTH]
+
+def rank_sentences(sentences):
+    """Score sentences by TextRank over their TF-IDF cosine similarity.
+
+    Args:
+        sentences: List of sentences
+
+    Returns:
+        numpy.ndarray: One score per sentence, summing to 1
+    """
+    weights = _tfidf_matrix(sentences)
+    similarity = weights @ weights.T                # Rows are unit length, so this is cosine similarity
+    np.fill_diagonal(similarity, 0.0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, row_sums, out=np.full_like(similarity, 1.0 / len(sentences)),
+                           where=row_sums > 0)      # Sentences sharing no words link to every sentence evenly
+
+    scores = np.full(len(sentences), 1.0 / len(sentences))
+    teleport = (1.0 - DAMPING) / len(sentences)
+    for _ in range(MAX_ITERATIONS):                 # Power iteration
+        updated = teleport + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).max() < TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+# Helpers
+def _tfidf_matrix(sentences):
+    """Build an L2-normalized sentence by term TF-IDF matrix."""
+    vocabulary = {}
+    rows, columns = [], []
+    for row, sentence in enumerate(sentences):
+        for token in search_index.tokenize(sentence):
+            if token not in STOP_WORDS:
+                rows.append(row)
+                columns.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    counts = np.zeros((len(sentences), max(1, len(vocabulary))))
+    np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1.0)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+    weights = np.log1p(counts) * idf                # Damp repeated words within a sentence
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return np.divide(weights, norms, out=np.zeros_like(weights), where=norms > 0)
@@ -0,0 +1,157 @@
+import functools
+import re
+import pricing
+
+try:
+    import tiktoken
+except ImportError:      # Optional dependency, counts are estimated without it
+    tiktoken = None
+
+# Budget Constants
+MAX_PROMPT_TOKENS = 12000           # Default limit for the whole prompt, see set_max_prompt_tokens()
+EXPECTED_OUTPUT_TOKENS = 600        # A 99-second script, used for the cost projection
+MESSAGE_OVERHEAD = 4                # Tokens the chat format adds around each message
+ARTICLE_OVERHEAD = 4                # Tokens for each article's bullet and separators
+CHARS_PER_TOKEN = 4                 # Estimate used when no tokenizer is available
+SENTENCE_END = re.compile(r"[.!?][\"')\]]?\s")
+
+_max_prompt_tokens = MAX_PROMPT_TOKENS
+
+def set_max_prompt_tokens(limit):
+    """Set the prompt size limit used by fit_articles for this process."""
+    global _max_prompt_tokens
+    _max_prompt_tokens = limit
+
+def get_max_prompt_tokens():
+    """Get the prompt size limit."""
+    return _max_prompt_tokens
+
+@functools.lru_cache(maxsize=8192)
+def count_tokens(text, model=pricing.DEFAULT_MODEL):
+    """Count the tokens in a piece of text, memoized so repeat counts are free.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use
+
+    Returns:
+        int: Token count, estimated from the length if no tokenizer is available
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def count_message_tokens(messages, model=pricing.DEFAULT_MODEL):
+    """Count the tokens a list of chat messages will use.
+
+    Args:
+        messages: Chat messages
+        model: Model whose tokenizer to use
+
+    Returns:
+        int: Prompt token count
+    """
+    return sum(count_tokens(message['content'], model) + MESSAGE_OVERHEAD for message in messages) + 2
+
+def fit_articles(articles, budget, model=pricing.DEFAULT_MODEL):
+    """Trim article bodies so together they fit in a token budget.
+
+    The budget is shared fairly: articles shorter than an even share keep all
+    of their text, and what they leave unused is split among the longer ones.
+    Trimmed bodies are cut back to the end of a sentence.
+
+    Args:
+        articles: List of article dictionaries
+        budget: Tokens available for every title and summary together
+        model: Model whose tokenizer to use
+
+    Returns:
+        list: Articles whose summaries fit, with 'trimmed_tokens' set on the ones cut
+    """
+    title_tokens = [count_tokens(article['title'], model) + ARTICLE_OVERHEAD for article in articles]
+    sizes = [count_tokens(article['summary'], model) for article in articles]
+    allocations = allocate(sizes, max(0, budget - sum(title_tokens)))
+
+    fitted = []
+    for article, size, allocation in zip(articles, sizes, allocations):
+        if allocation >= size:
+            fitted.append(article)
+        else:
+            fitted.append({**article, 'summary': truncate(article['summary'], allocation, model),
+                           'trimmed_tokens': size - allocation})
+    return fitted
+
+def allocate(sizes, budget):
+    """Split a budget across items by water-filling.
+
+    Args:
+        sizes: Tokens each item would like
+        budget: Tokens available
+
+    Returns:
+        list: Tokens granted to each item, never more than it asked for
+    """
+    allocations = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=sizes.__getitem__)
+    for position, index in enumerate(order):        # Smallest first, so leftovers flow to larger items
+        share = remaining // (len(sizes) - position)
+        allocations[index] = min(sizes[index], share)
+        remaining -= allocations[index]
+    return allocations
+
+def truncate(text, max_tokens, model=pricing.DEFAULT_MODEL):
+    """Cut text to at most max_tokens, backing off to the last sentence end.
+
+    Args:
+        text: Text to cut
+        max_tokens: Tokens allowed
+        model: Model whose tokenizer to use
+
+    Returns:
+        str: The cut text
+    """
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        cut = text[:max_tokens * CHARS_PER_TOKEN]
+    else:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    ends = [match.end() for match in SENTENCE_END.finditer(cut)]
+    if ends and ends[-1] > len(cut) // 2:           # Keep a partial sentence rather than lose half the text
+        cut = cut[:ends[-1]]
+    return cut.rstrip() + " [...]"
+
+def estimate_prompt_cost(messages, model=pricing.DEFAULT_MODEL, output_tokens=EXPECTED_OUTPUT_TOKENS):
+    """Project the size and cost of a request before sending it.
+
+    Args:
+        messages: Chat messages to send
+        model: Model the request goes to
+        output_tokens: Expected length of the response
+
+    Returns:
+        dict: 'prompt_tokens', 'limit' and 'cost' in US dollars
+    """
+    prompt_tokens = count_message_tokens(messages, model)
+    return {
+        'prompt_tokens': prompt_tokens,
+        'limit': _max_prompt_tokens,
+        'cost': pricing.estimate_cost(model, prompt_tokens, output_tokens),
+    }
+
+# Helpers
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model):
+    """Load a model's tokenizer once, or None if it is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:       # Unknown model or the encoding could not be downloaded
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
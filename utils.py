@@ -32,6 +32,7 @@ if platform.system().lower() == 'darwin':
 else:
     PGN_HOTKEY = 15  # Default ASCII value for Ctrl+O
 RESET_HOTKEY = 18                                          # ASCII value for Ctrl+R
+HISTORY_HOTKEY = 2                                         # ASCII value for Ctrl+B
 if hasattr(curses, 'BUTTON5_PRESSED'):
     MOUSE_DOWN = curses.BUTTON5_PRESSED if not IS_WINDOWS else WINDOWS_SCROLL_DOWN # Scroll down, scroll values vary between platforms
 if hasattr(curses, 'BUTTON4_PRESSED'):